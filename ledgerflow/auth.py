@@ -3,6 +3,7 @@ from __future__ import annotations
 import json
 import os
 from datetime import UTC, datetime
+from functools import lru_cache
 from typing import Any
 
 
@@ -130,25 +131,17 @@ def required_scopes_for_request(method: str, path: str) -> list[str] | None:
     if p == "/api/health" or m == "OPTIONS":
         return None
 
-    scopes: list[str] = ["read" if m in ("GET", "HEAD") else "write"]
+    base = "read" if m in ("GET", "HEAD") else "write"
 
-    if p.startswith("/api/automation/"):
-        scopes.append("automation")
-    if p == "/api/alerts/deliver":
-        scopes.append("automation")
+    # The feature prefixes below are mutually exclusive, so a path needs at most one extra
+    # scope and the result never has duplicates.
+    if p.startswith("/api/automation/") or p == "/api/alerts/deliver":
+        return [base, "automation"]
     if p == "/api/ops/metrics":
-        scopes.append("ops")
+        return [base, "ops"]
     if p == "/api/auth/keys" or p.startswith("/api/backup/"):
-        scopes.append("admin")
-
-    # Preserve order while deduplicating.
-    out: list[str] = []
-    seen: set[str] = set()
-    for s in scopes:
-        if s not in seen:
-            out.append(s)
-            seen.add(s)
-    return out
+        return [base, "admin"]
+    return [base]
 
 
 def scope_for_request(method: str, path: str) -> str | None:
@@ -158,13 +151,7 @@ def scope_for_request(method: str, path: str) -> str | None:
     return scopes[0]
 
 
-def key_has_scope(meta: dict[str, Any], required: str) -> bool:
-    if not bool(meta.get("enabled", True)):
-        return False
-    exp = _parse_expiry(meta.get("expiresAt"))
-    if exp is not None and datetime.now(UTC) >= exp:
-        return False
-
+def _scope_granted(meta: dict[str, Any], required: str) -> bool:
     scopes = {str(x) for x in (meta.get("scopes") or [])}
     if "admin" in scopes:
         return True
@@ -173,10 +160,24 @@ def key_has_scope(meta: dict[str, Any], required: str) -> bool:
     return required in scopes
 
 
+def key_has_scope(meta: dict[str, Any], required: str) -> bool:
+    if not bool(meta.get("enabled", True)):
+        return False
+    exp = _parse_expiry(meta.get("expiresAt"))
+    if exp is not None and datetime.now(UTC) >= exp:
+        return False
+    return _scope_granted(meta, required)
+
+
 def _parse_expiry(value: Any) -> datetime | None:
     if value is None:
         return None
-    s = str(value).strip()
+    return _parse_expiry_text(str(value).strip())
+
+
+# Keys carry a handful of fixed expiry strings; each is parsed once, not on every request.
+@lru_cache(maxsize=256)
+def _parse_expiry_text(s: str) -> datetime | None:
     if not s:
         return None
     if s.endswith("Z"):
@@ -196,7 +197,7 @@ def scope_denial_reason(meta: dict[str, Any], required: str) -> str | None:
     exp = _parse_expiry(meta.get("expiresAt"))
     if exp is not None and datetime.now(UTC) >= exp:
         return "api_key_expired"
-    if key_has_scope(meta, required):
+    if _scope_granted(meta, required):
         return None
     return "insufficient_scope"
 
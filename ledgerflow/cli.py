@@ -3,7 +3,9 @@ from __future__ import annotations
 import argparse
 import json
 import sys
+from itertools import islice
 from pathlib import Path
+from typing import Any
 
 from .ai_analysis import analyze_spending
 from .automation import dispatch_due_and_work, enqueue_due_jobs, enqueue_task, list_dead_letters, list_tasks, queue_stats, read_jobs, run_next_task, run_worker, write_jobs
@@ -15,14 +17,14 @@ from .csv_import import CsvMapping, csv_row_to_tx, infer_mapping, read_csv_rows
 from .connectors import import_connector_path, list_connectors
 from .exporting import export_transactions_csv
 from .integration_bank_json import import_bank_json_path
-from .index_db import has_source_hash, index_stats, rebuild_index
+from .index_db import index_stats, rebuild_index, source_hashes
 from .layout import layout_for
 from .manual import ManualEntry, correction_event, manual_entry_to_tx, parse_amount, tombstone_event
 from .migrations import APP_SCHEMA_VERSION, migrate_to_latest, status as migration_status
 from .reporting import write_daily_report, write_monthly_report
 from .review import resolve_review_transaction, review_queue
 from .sources import register_file
-from .storage import append_jsonl
+from .storage import append_jsonl, append_jsonl_many
 from .alerts import run_alerts
 from .alert_delivery import deliver_alert_events, list_outbox_entries
 from .charts import write_category_breakdown_month, write_merchant_top_month, write_series
@@ -377,8 +379,13 @@ def _cmd_import_csv(args: argparse.Namespace) -> int:
     errors = 0
     printed = 0
 
+    # Hashes already imported for this doc, loaded once instead of queried per row.
+    existing = source_hashes(layout, doc_id=doc_id) if args.commit else set()
+    pending: list[dict[str, Any]] = []
     max_rows = args.max_rows if args.max_rows is not None else len(rows)
-    for i, row in enumerate(rows[:max_rows], start=1):
+    if max_rows < 0:
+        max_rows = max(0, len(rows) + max_rows)  # same rows as the old rows[:max_rows] slice
+    for i, row in enumerate(islice(rows, max_rows), start=1):
         try:
             tx = csv_row_to_tx(
                 doc_id=doc_id,
@@ -397,16 +404,20 @@ def _cmd_import_csv(args: argparse.Namespace) -> int:
 
         if args.commit:
             h = tx["source"]["sourceHash"]
-            if has_source_hash(layout, doc_id=doc_id, source_hash=h):
+            if h in existing:
                 skipped += 1
                 continue
-            append_jsonl(layout.transactions_path, tx)
+            existing.add(h)
+            pending.append(tx)
             imported += 1
         else:
             if printed < args.sample:
                 print(json.dumps(tx, ensure_ascii=False))
                 printed += 1
 
+    # One write (and one index session) for the whole import instead of one per row.
+    append_jsonl_many(layout.transactions_path, pending)
+
     print(
         json.dumps(
             {
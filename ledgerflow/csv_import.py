@@ -2,7 +2,9 @@ from __future__ import annotations
 
 import csv
 from dataclasses import dataclass
+from datetime import datetime
 from decimal import Decimal, InvalidOperation
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
@@ -92,19 +94,18 @@ def parse_amount_text(value: str) -> Decimal:
     return -d if negative else d
 
 
+# Statement exports repeat the same date on many rows, so each distinct (value, format)
+# is parsed once, like pandas' to_datetime(cache=True). Failures are not cached and re-raise.
+@lru_cache(maxsize=4096)
 def _parse_date_text(value: str, *, date_format: str | None, day_first: bool) -> str:
     s = value.strip()
     if not s:
         raise ValueError("Empty date")
 
     if date_format:
-        from datetime import datetime
-
         return datetime.strptime(s, date_format).date().isoformat()
 
     # Try a few common formats. If ambiguous, prefer based on day_first.
-    from datetime import datetime
-
     # ISO first.
     for fmt in ("%Y-%m-%d", "%Y/%m/%d"):
         try:
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import re
 from datetime import datetime, timedelta
 from decimal import Decimal
 from typing import Any
@@ -12,11 +13,15 @@ from .storage import append_jsonl
 from .timeutil import utc_now_iso
 from .txutil import tx_amount_decimal, tx_currency, tx_date, tx_merchant, tx_source_type
 
+_NORM_RE = re.compile(r"[^a-z0-9]+")
 
-def _norm(s: str) -> str:
-    import re
 
-    return re.sub(r"[^a-z0-9]+", " ", s.lower()).strip()
+def _norm(s: str) -> str:
+    lo = s.lower()
+    # Plain ASCII words separated by spaces only need their space runs collapsed.
+    if lo.isascii() and lo.replace(" ", "").isalnum():
+        return " ".join(lo.split())
+    return _NORM_RE.sub(" ", lo).strip()
 
 
 def _merchant_score(a: str, b: str) -> float:
@@ -1,11 +1,16 @@
 from __future__ import annotations
 
 import base64
+import functools
+import importlib
 import io
+import itertools
 import os
 import shutil
 import subprocess
 import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
@@ -16,33 +21,64 @@ class MissingDependencyError(LedgerFlowError):
     pass
 
 
-def ocr_capabilities() -> dict[str, Any]:
-    caps = {
-        "pdfplumber": False,
-        "pypdf": False,
-        "pytesseract": False,
+# Optional backends are imported at most once per process; None records a failed import.
+_OPTIONAL_MODULES: dict[str, Any] = {}
+
+
+def _optional_module(name: str) -> Any:
+    if name not in _OPTIONAL_MODULES:
+        try:
+            _OPTIONAL_MODULES[name] = importlib.import_module(name)
+        except Exception:
+            _OPTIONAL_MODULES[name] = None
+    return _OPTIONAL_MODULES[name]
+
+
+# tesserocr keeps one tesseract engine (with language data loaded) alive for the whole process.
+# The engine is not thread-safe, so every use goes through the lock. False records a failed init.
+_TESSEROCR_LOCK = threading.Lock()
+_TESSEROCR_API: Any = None
+
+
+def _tesserocr_api() -> Any:
+    global _TESSEROCR_API
+    if _TESSEROCR_API is None:
+        tesserocr = _optional_module("tesserocr")
+        if tesserocr is None:
+            return None
+        with _TESSEROCR_LOCK:
+            if _TESSEROCR_API is None:
+                try:
+                    _TESSEROCR_API = tesserocr.PyTessBaseAPI(lang="eng", psm=tesserocr.PSM.SINGLE_BLOCK)
+                except Exception:
+                    _TESSEROCR_API = False
+    return _TESSEROCR_API or None
+
+
+# Below this many pages, process start-up costs more than the parallel extraction saves.
+_PDF_PARALLEL_MIN_PAGES = 4
+
+# Minimum quality for pypdf output before falling back to pdfplumber.
+_PDF_MIN_TEXT_CHARS = 50
+_PDF_MIN_ALPHA_RATIO = 0.3
+
+
+@functools.lru_cache(maxsize=1)
+def _local_backend_capabilities() -> dict[str, bool]:
+    return {
+        "pdfplumber": _optional_module("pdfplumber") is not None,
+        "pypdf": _optional_module("pypdf") is not None,
+        "pytesseract": _optional_module("pytesseract") is not None,
+        "tesserocr": _optional_module("tesserocr") is not None,
         "tesseract_cli": bool(shutil.which("tesseract")),
-        "openai_vision": False,
     }
-    try:
-        import pdfplumber  # type: ignore  # noqa: F401
 
-        caps["pdfplumber"] = True
-    except Exception:
-        pass
-    try:
-        from pypdf import PdfReader  # type: ignore  # noqa: F401
 
-        caps["pypdf"] = True
-    except Exception:
-        pass
-    try:
-        _import_pytesseract()
-        caps["pytesseract"] = True
-    except Exception:
-        pass
+def ocr_capabilities() -> dict[str, Any]:
+    caps: dict[str, Any] = dict(_local_backend_capabilities())
+    # Depends on OPENAI_API_KEY, which may change at runtime; not cached.
     caps["openai_vision"] = _openai_vision_available()
-    caps["image_ocr_available"] = bool(caps["pytesseract"] or caps["tesseract_cli"])
+    caps["image_ocr_available"] = bool(caps["tesserocr"] or caps["pytesseract"] or caps["tesseract_cli"])
     caps["pdf_text_available"] = bool(caps["pdfplumber"] or caps["pypdf"])
     return caps
 
@@ -68,37 +104,57 @@ def extract_text(
     raise LedgerFlowError(f"Unsupported file type for text extraction: {ext}")
 
 
+def _extract_pdf_page(path: str, page_index: int) -> str:
+    pdfplumber = _optional_module("pdfplumber")
+    with pdfplumber.open(path) as pdf:
+        return pdf.pages[page_index].extract_text() or ""
+
+
+def _pdf_text_usable(text: str) -> bool:
+    # pypdf returns empty or glyph soup for some layouts; treat that as a miss.
+    if len(text) < _PDF_MIN_TEXT_CHARS:
+        return False
+    alpha = sum(1 for ch in text if ch.isalpha())
+    return alpha / len(text) >= _PDF_MIN_ALPHA_RATIO
+
+
 def _extract_text_pdf(p: Path) -> tuple[str, dict[str, Any]]:
-    # Try pdfplumber first (best quality for text extraction).
-    try:
-        import pdfplumber  # type: ignore
+    # Try pypdf first: plain text extraction without pdfminer's layout analysis is much faster.
+    pypdf = _optional_module("pypdf")
+    pypdf_text: str | None = None
+    pypdf_error: Exception | None = None
+    if pypdf is not None:
+        try:
+            reader = pypdf.PdfReader(str(p))
+            pypdf_text = "\n\n".join(page.extract_text() or "" for page in reader.pages).strip()
+        except Exception as e:
+            pypdf_error = e
+        if pypdf_text is not None and _pdf_text_usable(pypdf_text):
+            return pypdf_text, {"method": "pypdf"}
+
+    # Fallback: pdfplumber (slower, better on tricky layouts).
+    pdfplumber = _optional_module("pdfplumber")
+    if pdfplumber is None:
+        if pypdf_text is not None:
+            return pypdf_text, {"method": "pypdf"}
+        if pypdf_error is not None:
+            raise LedgerFlowError(f"Failed to extract PDF text via pypdf: {pypdf_error}") from pypdf_error
+        raise MissingDependencyError("PDF text extraction requires an optional dependency. Install one of: pdfplumber, pypdf.")
 
-        parts = []
+    try:
         with pdfplumber.open(str(p)) as pdf:
-            for page in pdf.pages:
-                parts.append(page.extract_text() or "")
-        return "\n\n".join(parts).strip(), {"method": "pdfplumber"}
-    except ModuleNotFoundError:
-        pass
+            n_pages = len(pdf.pages)
+            parts = None if n_pages >= _PDF_PARALLEL_MIN_PAGES else [page.extract_text() or "" for page in pdf.pages]
+        if parts is None:
+            # Layout analysis is CPU-bound per page; fan pages out across processes.
+            workers = min(os.cpu_count() or 1, n_pages)
+            with ProcessPoolExecutor(max_workers=workers) as ex:
+                parts = list(ex.map(_extract_pdf_page, itertools.repeat(str(p)), range(n_pages)))
+        method = "pdfplumber" if pypdf is None else "pdfplumber_fallback"
+        return "\n\n".join(parts).strip(), {"method": method}
     except Exception as e:
         raise LedgerFlowError(f"Failed to extract PDF text via pdfplumber: {e}") from e
 
-    # Fallback: pypdf
-    try:
-        from pypdf import PdfReader  # type: ignore
-
-        reader = PdfReader(str(p))
-        parts = []
-        for page in reader.pages:
-            parts.append(page.extract_text() or "")
-        return "\n\n".join(parts).strip(), {"method": "pypdf"}
-    except ModuleNotFoundError as e:
-        raise MissingDependencyError(
-            "PDF text extraction requires an optional dependency. Install one of: pdfplumber, pypdf."
-        ) from e
-    except Exception as e:
-        raise LedgerFlowError(f"Failed to extract PDF text via pypdf: {e}") from e
-
 
 def _extract_text_image(p: Path, *, image_provider: str = "auto", preprocess: bool = True) -> tuple[str, dict[str, Any]]:
     provider = image_provider.lower().strip()
@@ -141,24 +197,38 @@ def _extract_text_image(p: Path, *, image_provider: str = "auto", preprocess: bo
 
 
 def _ocr_with_pytesseract(path: Path, *, preprocess: bool) -> tuple[str, dict[str, Any]]:
-    pytesseract = _import_pytesseract()
-    from PIL import Image
+    # Prefer the in-process tesserocr engine; pytesseract spawns a tesseract process per image.
+    api = _tesserocr_api()
+    if api is not None:
+        method = "tesserocr"
 
+        def _ocr(variant: Any) -> str:
+            with _TESSEROCR_LOCK:
+                api.SetImage(variant)
+                return (api.GetUTF8Text() or "").strip()
+
+    else:
+        method = "pytesseract"
+        pytesseract = _import_pytesseract()
+
+        def _ocr(variant: Any) -> str:
+            return (pytesseract.image_to_string(variant, config="--psm 6") or "").strip()
+
+    Image = _import_pil_image()
     img = Image.open(str(path))
     variants = _image_variants(img) if preprocess else [("original", img)]
 
     best_text = ""
     best_variant = "original"
     best_score = -1.0
-    for name, variant in variants:
-        text = (pytesseract.image_to_string(variant, config="--psm 6") or "").strip()
+    for (name, _), text in zip(variants, _map_variants(_ocr, [v for _, v in variants])):
         score = _ocr_score(text)
         if score > best_score:
             best_text = text
             best_variant = name
             best_score = score
 
-    return best_text, {"method": "pytesseract", "variant": best_variant, "score": round(best_score, 3), "preprocess": preprocess}
+    return best_text, {"method": method, "variant": best_variant, "score": round(best_score, 3), "preprocess": preprocess}
 
 
 def _ocr_with_tesseract_cli(path: Path, *, preprocess: bool) -> tuple[str, dict[str, Any]]:
@@ -166,7 +236,7 @@ def _ocr_with_tesseract_cli(path: Path, *, preprocess: bool) -> tuple[str, dict[
     if not tesseract:
         raise MissingDependencyError("tesseract binary not found on PATH")
 
-    from PIL import Image
+    Image = _import_pil_image()
 
     img = Image.open(str(path))
     variants = _image_variants(img) if preprocess else [("original", img)]
@@ -176,7 +246,9 @@ def _ocr_with_tesseract_cli(path: Path, *, preprocess: bool) -> tuple[str, dict[
     best_score = -1.0
 
     with tempfile.TemporaryDirectory() as td:
-        for name, variant in variants:
+
+        def _ocr(item: tuple[str, Any]) -> str | None:
+            name, variant = item
             in_path = Path(td) / f"{name}.png"
             variant.save(str(in_path), format="PNG")
             proc = subprocess.run(
@@ -186,8 +258,12 @@ def _ocr_with_tesseract_cli(path: Path, *, preprocess: bool) -> tuple[str, dict[
                 check=False,
             )
             if proc.returncode != 0:
+                return None
+            return (proc.stdout or "").strip()
+
+        for (name, _), text in zip(variants, _map_variants(_ocr, variants)):
+            if text is None:
                 continue
-            text = (proc.stdout or "").strip()
             score = _ocr_score(text)
             if score > best_score:
                 best_text = text
@@ -204,18 +280,17 @@ def _ocr_with_openai_vision(path: Path) -> tuple[str, dict[str, Any]]:
     if not _openai_vision_available():
         raise MissingDependencyError("OpenAI vision OCR is not available (needs OPENAI_API_KEY and openai package).")
 
-    try:
-        from openai import OpenAI  # type: ignore
-        from PIL import Image
-    except Exception as e:
-        raise MissingDependencyError("OpenAI OCR requires openai and Pillow packages.") from e
+    openai = _optional_module("openai")
+    Image = _optional_module("PIL.Image")
+    if openai is None or Image is None:
+        raise MissingDependencyError("OpenAI OCR requires openai and Pillow packages.")
 
     img = Image.open(str(path)).convert("RGB")
     bio = io.BytesIO()
     img.save(bio, format="PNG")
     b64 = base64.b64encode(bio.getvalue()).decode("ascii")
 
-    client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
+    client = openai.OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
     resp = client.responses.create(
         model="gpt-4.1-mini",
         input=[
@@ -233,6 +308,14 @@ def _ocr_with_openai_vision(path: Path) -> tuple[str, dict[str, Any]]:
     return text, {"method": "openai_vision", "model": "gpt-4.1-mini"}
 
 
+def _map_variants(fn: Any, items: list[Any]) -> list[Any]:
+    # Each OCR call runs tesseract in a subprocess, so threads give real parallelism here.
+    if len(items) < 2:
+        return [fn(x) for x in items]
+    with ThreadPoolExecutor(max_workers=min(os.cpu_count() or 1, len(items))) as ex:
+        return list(ex.map(fn, items))
+
+
 def _ocr_score(text: str) -> float:
     s = text.strip()
     if not s:
@@ -256,18 +339,18 @@ def _image_variants(img: Any) -> list[tuple[str, Any]]:
 def _openai_vision_available() -> bool:
     if not os.environ.get("OPENAI_API_KEY"):
         return False
-    try:
-        from openai import OpenAI  # type: ignore  # noqa: F401
-
-        return True
-    except Exception:
-        return False
+    return _optional_module("openai") is not None
 
 
 def _import_pytesseract() -> Any:
-    try:
-        import pytesseract  # type: ignore
+    pytesseract = _optional_module("pytesseract")
+    if pytesseract is None:
+        raise ModuleNotFoundError("pytesseract not available")
+    return pytesseract
 
-        return pytesseract
-    except Exception as e:
-        raise ModuleNotFoundError("pytesseract not available") from e
+
+def _import_pil_image() -> Any:
+    image = _optional_module("PIL.Image")
+    if image is None:
+        raise ModuleNotFoundError("Pillow not available")
+    return image
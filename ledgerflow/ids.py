@@ -1,17 +1,20 @@
 from __future__ import annotations
 
+import base64
 import secrets
 import time
 
 
 _CROCKFORD32 = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
 
+# RFC 4648 base32 alphabet -> Crockford alphabet, applied to base64.b32encode output.
+_B32_TO_CROCKFORD = bytes.maketrans(b"ABCDEFGHIJKLMNOPQRSTUVWXYZ234567", _CROCKFORD32.encode("ascii"))
 
-def ulid() -> str:
-    """
-    Generate a ULID (26 chars, Crockford base32).
-    Not monotonic; good enough for ids/log lines.
-    """
+# Encoded "<prefix>_" per id prefix; new_id is called with a handful of fixed prefixes.
+_PREFIX_BYTES: dict[str, bytes] = {}
+
+
+def _ulid_bytes() -> bytes:
     ts_ms = int(time.time() * 1000)
     rand = secrets.randbits(80)
     value = (ts_ms << 80) | rand  # 128 bits
@@ -19,13 +22,20 @@ def ulid() -> str:
     # ULID uses 26 base32 chars = 130 bits. Left-pad with 2 zeros.
     value <<= 2
 
-    out = []
-    for i in range(26):
-        shift = (25 - i) * 5
-        out.append(_CROCKFORD32[(value >> shift) & 0x1F])
-    return "".join(out)
+    # Encode as 160 bits (32 chars) in C and keep the low 130 bits (last 26 chars).
+    return base64.b32encode(value.to_bytes(20, "big"))[-26:].translate(_B32_TO_CROCKFORD)
 
 
-def new_id(prefix: str) -> str:
-    return f"{prefix}_{ulid()}"
+def ulid() -> str:
+    """
+    Generate a ULID (26 chars, Crockford base32).
+    Not monotonic; good enough for ids/log lines.
+    """
+    return _ulid_bytes().decode("ascii")
+
 
+def new_id(prefix: str) -> str:
+    head = _PREFIX_BYTES.get(prefix)
+    if head is None:
+        head = _PREFIX_BYTES[prefix] = prefix.encode("utf-8") + b"_"
+    return (head + _ulid_bytes()).decode("utf-8")
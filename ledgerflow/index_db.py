@@ -11,7 +11,7 @@ from .layout import Layout, layout_for
 from .storage import ensure_dir, read_json
 from .timeutil import utc_now_iso
 
-INDEX_SCHEMA_VERSION = 1
+INDEX_SCHEMA_VERSION = 2
 
 
 def _connect(db_path: str | Path) -> sqlite3.Connection:
@@ -31,6 +31,11 @@ def _session(db_path: str | Path) -> Any:
         yield conn
         conn.commit()
     finally:
+        try:
+            # Cheap unless the planner's statistics look stale.
+            conn.execute("PRAGMA optimize")
+        except sqlite3.Error:
+            pass
         conn.close()
 
 
@@ -88,10 +93,16 @@ def ensure_index_schema(db_path: str | Path) -> None:
             CREATE INDEX IF NOT EXISTS idx_tx_month ON transactions (month);
             CREATE INDEX IF NOT EXISTS idx_tx_category ON transactions (category_id);
             CREATE INDEX IF NOT EXISTS idx_tx_source_type ON transactions (source_type);
-            CREATE INDEX IF NOT EXISTS idx_tx_deleted ON transactions (is_deleted);
+            -- Partial index serving the recent-transactions listing; it also covers is_deleted=0 scans.
+            DROP INDEX IF EXISTS idx_tx_deleted;
+            CREATE INDEX IF NOT EXISTS idx_tx_recent ON transactions (occurred_at DESC, updated_at DESC) WHERE is_deleted = 0;
             CREATE INDEX IF NOT EXISTS idx_corr_tx_id ON corrections (tx_id);
             """
         )
+        row = conn.execute("SELECT value FROM meta WHERE key='index_schema_version'").fetchone()
+        if row is None or row[0] != str(INDEX_SCHEMA_VERSION):
+            # Index set changed: refresh planner statistics once.
+            conn.execute("ANALYZE")
         conn.execute(
             """
             INSERT INTO meta(key, value) VALUES('index_schema_version', ?)
@@ -101,140 +112,161 @@ def ensure_index_schema(db_path: str | Path) -> None:
         )
 
 
-def _tx_fields(tx: dict[str, Any]) -> dict[str, Any]:
+def _tx_values(tx: dict[str, Any]) -> tuple[Any, ...]:
+    """Indexed column values for tx, in _TX_UPSERT_SQL column order (tx_id .. raw_json)."""
     src = tx.get("source") if isinstance(tx.get("source"), dict) else {}
     amt = tx.get("amount") if isinstance(tx.get("amount"), dict) else {}
     cat = tx.get("category") if isinstance(tx.get("category"), dict) else {}
     occurred_at = str(tx.get("occurredAt") or "")
     month = occurred_at[:7] if len(occurred_at) >= 7 else ""
-    return {
-        "tx_id": str(tx.get("txId") or ""),
-        "source_type": str(src.get("sourceType") or ""),
-        "source_doc_id": str(src.get("docId") or ""),
-        "source_hash": str(src.get("sourceHash") or ""),
-        "occurred_at": occurred_at,
-        "posted_at": str(tx.get("postedAt") or ""),
-        "month": month,
-        "amount_value": str(amt.get("value") or ""),
-        "currency": str(amt.get("currency") or ""),
-        "direction": str(tx.get("direction") or ""),
-        "merchant": str(tx.get("merchant") or ""),
-        "category_id": str(cat.get("id") or ""),
-        "raw_json": json.dumps(tx, ensure_ascii=False),
-    }
+    return (
+        str(tx.get("txId") or ""),
+        str(src.get("sourceType") or ""),
+        str(src.get("docId") or ""),
+        str(src.get("sourceHash") or ""),
+        occurred_at,
+        str(tx.get("postedAt") or ""),
+        month,
+        str(amt.get("value") or ""),
+        str(amt.get("currency") or ""),
+        str(tx.get("direction") or ""),
+        str(tx.get("merchant") or ""),
+        str(cat.get("id") or ""),
+        json.dumps(tx, ensure_ascii=False),
+    )
+
+
+def _tx_row_tuple(tx: dict[str, Any], is_deleted: bool, now: str) -> tuple[Any, ...]:
+    return _tx_values(tx) + (1 if is_deleted else 0, now, now)
+
+
+_TX_UPSERT_SQL = """
+    INSERT INTO transactions (
+        tx_id, source_type, source_doc_id, source_hash, occurred_at, posted_at, month,
+        amount_value, currency, direction, merchant, category_id, raw_json, is_deleted,
+        created_at, updated_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(tx_id) DO UPDATE SET
+        source_type=excluded.source_type,
+        source_doc_id=excluded.source_doc_id,
+        source_hash=excluded.source_hash,
+        occurred_at=excluded.occurred_at,
+        posted_at=excluded.posted_at,
+        month=excluded.month,
+        amount_value=excluded.amount_value,
+        currency=excluded.currency,
+        direction=excluded.direction,
+        merchant=excluded.merchant,
+        category_id=excluded.category_id,
+        raw_json=excluded.raw_json,
+        is_deleted=excluded.is_deleted,
+        updated_at=excluded.updated_at
+"""
 
 
 def upsert_transaction(db_path: str | Path, tx: dict[str, Any], *, is_deleted: bool = False) -> None:
-    fields = _tx_fields(tx)
-    if not fields["tx_id"]:
+    row = _tx_row_tuple(tx, is_deleted, utc_now_iso())
+    if not row[0]:
         return
+    ensure_index_schema(db_path)
+    with _session(db_path) as conn:
+        conn.execute(_TX_UPSERT_SQL, row)
+
+
+def upsert_transactions(db_path: str | Path, txs: list[dict[str, Any]]) -> None:
+    """Upsert many transactions in one session/commit."""
     now = utc_now_iso()
+    rows = [row for row in (_tx_row_tuple(tx, False, now) for tx in txs) if row[0]]
+    if not rows:
+        return
     ensure_index_schema(db_path)
     with _session(db_path) as conn:
-        conn.execute(
-            """
-            INSERT INTO transactions (
-                tx_id, source_type, source_doc_id, source_hash, occurred_at, posted_at, month,
-                amount_value, currency, direction, merchant, category_id, raw_json, is_deleted,
-                created_at, updated_at
-            ) VALUES (
-                :tx_id, :source_type, :source_doc_id, :source_hash, :occurred_at, :posted_at, :month,
-                :amount_value, :currency, :direction, :merchant, :category_id, :raw_json, :is_deleted,
-                :created_at, :updated_at
-            )
-            ON CONFLICT(tx_id) DO UPDATE SET
-                source_type=excluded.source_type,
-                source_doc_id=excluded.source_doc_id,
-                source_hash=excluded.source_hash,
-                occurred_at=excluded.occurred_at,
-                posted_at=excluded.posted_at,
-                month=excluded.month,
-                amount_value=excluded.amount_value,
-                currency=excluded.currency,
-                direction=excluded.direction,
-                merchant=excluded.merchant,
-                category_id=excluded.category_id,
-                raw_json=excluded.raw_json,
-                is_deleted=excluded.is_deleted,
-                updated_at=excluded.updated_at
-            """,
-            {
-                **fields,
-                "is_deleted": 1 if is_deleted else 0,
-                "created_at": now,
-                "updated_at": now,
-            },
-        )
+        conn.executemany(_TX_UPSERT_SQL, rows)
 
 
 def _deep_merge_inplace(dst: dict[str, Any], patch: dict[str, Any]) -> None:
-    for k, v in patch.items():
-        if isinstance(v, dict) and isinstance(dst.get(k), dict):
-            _deep_merge_inplace(dst[k], v)  # type: ignore[index]
-        else:
-            dst[k] = v
+    # Iterative so deeply nested patches cannot hit the recursion limit.
+    stack = [(dst, patch)]
+    while stack:
+        d, p = stack.pop()
+        for k, v in p.items():
+            if isinstance(v, dict) and isinstance(d.get(k), dict):
+                stack.append((d[k], v))
+            else:
+                d[k] = v
 
 
 def apply_correction_event(db_path: str | Path, evt: dict[str, Any]) -> None:
-    event_id = str(evt.get("eventId") or "")
-    tx_id = str(evt.get("txId") or "")
-    if not event_id or not tx_id:
+    apply_correction_events(db_path, [evt])
+
+
+def apply_correction_events(db_path: str | Path, evts: list[dict[str, Any]]) -> None:
+    """Apply many correction events, in order, in one session/commit."""
+    evts = [evt for evt in evts if evt.get("eventId") and evt.get("txId")]
+    if not evts:
         return
     ensure_index_schema(db_path)
     with _session(db_path) as conn:
+        for evt in evts:
+            _apply_correction(conn, evt)
+
+
+def _apply_correction(conn: sqlite3.Connection, evt: dict[str, Any]) -> None:
+    event_id = str(evt.get("eventId") or "")
+    tx_id = str(evt.get("txId") or "")
+    conn.execute(
+        """
+        INSERT INTO corrections(event_id, tx_id, event_type, at, raw_json)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(event_id) DO UPDATE SET
+            tx_id=excluded.tx_id,
+            event_type=excluded.event_type,
+            at=excluded.at,
+            raw_json=excluded.raw_json
+        """,
+        (
+            event_id,
+            tx_id,
+            str(evt.get("type") or ""),
+            str(evt.get("at") or ""),
+            json.dumps(evt, ensure_ascii=False),
+        ),
+    )
+
+    row = conn.execute("SELECT raw_json, is_deleted FROM transactions WHERE tx_id = ?", (tx_id,)).fetchone()
+    if row is None:
+        return
+
+    tx = json.loads(row["raw_json"])
+    evt_type = str(evt.get("type") or "patch")
+
+    if evt_type == "patch":
+        patch = evt.get("patch")
+        if isinstance(patch, dict):
+            _deep_merge_inplace(tx, patch)
+        values = _tx_values(tx)
         conn.execute(
             """
-            INSERT INTO corrections(event_id, tx_id, event_type, at, raw_json)
-            VALUES (?, ?, ?, ?, ?)
-            ON CONFLICT(event_id) DO UPDATE SET
-                tx_id=excluded.tx_id,
-                event_type=excluded.event_type,
-                at=excluded.at,
-                raw_json=excluded.raw_json
+            UPDATE transactions
+            SET source_type=?,
+                source_doc_id=?,
+                source_hash=?,
+                occurred_at=?,
+                posted_at=?,
+                month=?,
+                amount_value=?,
+                currency=?,
+                direction=?,
+                merchant=?,
+                category_id=?,
+                raw_json=?,
+                updated_at=?
+            WHERE tx_id=?
             """,
-            (
-                event_id,
-                tx_id,
-                str(evt.get("type") or ""),
-                str(evt.get("at") or ""),
-                json.dumps(evt, ensure_ascii=False),
-            ),
+            values[1:] + (utc_now_iso(), values[0]),
         )
-
-        row = conn.execute("SELECT raw_json, is_deleted FROM transactions WHERE tx_id = ?", (tx_id,)).fetchone()
-        if row is None:
-            return
-
-        tx = json.loads(row["raw_json"])
-        evt_type = str(evt.get("type") or "patch")
-
-        if evt_type == "patch":
-            patch = evt.get("patch")
-            if isinstance(patch, dict):
-                _deep_merge_inplace(tx, patch)
-            fields = _tx_fields(tx)
-            conn.execute(
-                """
-                UPDATE transactions
-                SET source_type=:source_type,
-                    source_doc_id=:source_doc_id,
-                    source_hash=:source_hash,
-                    occurred_at=:occurred_at,
-                    posted_at=:posted_at,
-                    month=:month,
-                    amount_value=:amount_value,
-                    currency=:currency,
-                    direction=:direction,
-                    merchant=:merchant,
-                    category_id=:category_id,
-                    raw_json=:raw_json,
-                    updated_at=:updated_at
-                WHERE tx_id=:tx_id
-                """,
-                {**fields, "updated_at": utc_now_iso()},
-            )
-        elif evt_type in ("tombstone", "delete"):
-            conn.execute("UPDATE transactions SET is_deleted = 1, updated_at = ? WHERE tx_id = ?", (utc_now_iso(), tx_id))
+    elif evt_type in ("tombstone", "delete"):
+        conn.execute("UPDATE transactions SET is_deleted = 1, updated_at = ? WHERE tx_id = ?", (utc_now_iso(), tx_id))
 
 
 
@@ -295,6 +327,18 @@ def hook_after_append(path: str | Path, obj: Any) -> None:
         apply_correction_event(layout.index_db_path, obj)
 
 
+def hook_after_append_many(path: str | Path, objs: list[Any]) -> None:
+    p = Path(path)
+    layout = _layout_from_jsonl_path(p)
+    if layout is None:
+        return
+    items = [obj for obj in objs if isinstance(obj, dict)]
+    if p.name == "transactions.jsonl":
+        upsert_transactions(layout.index_db_path, items)
+    elif p.name == "corrections.jsonl":
+        apply_correction_events(layout.index_db_path, items)
+
+
 def hook_after_source_register(index_path: str | Path, doc: dict[str, Any]) -> None:
     p = Path(index_path)
     if p.name != "index.json" or p.parent.name != "sources":
@@ -314,10 +358,9 @@ def rebuild_index(layout: Layout) -> dict[str, Any]:
     evt_count = 0
     src_count = 0
 
-    for tx in iter_jsonl(layout.transactions_path) or []:
-        if isinstance(tx, dict):
-            upsert_transaction(layout.index_db_path, tx, is_deleted=False)
-            tx_count += 1
+    txs = [tx for tx in iter_jsonl(layout.transactions_path) or [] if isinstance(tx, dict)]
+    upsert_transactions(layout.index_db_path, txs)
+    tx_count = len(txs)
 
     for evt in iter_jsonl(layout.corrections_path) or []:
         if isinstance(evt, dict):
@@ -332,6 +375,9 @@ def rebuild_index(layout: Layout) -> dict[str, Any]:
                 upsert_source(layout.index_db_path, doc)
                 src_count += 1
 
+    with _session(layout.index_db_path) as conn:
+        conn.execute("ANALYZE")
+
     return {"transactionsIndexed": tx_count, "correctionsIndexed": evt_count, "sourcesIndexed": src_count, "dbPath": str(layout.index_db_path)}
 
 
@@ -363,6 +409,17 @@ def has_source_hash(layout: Layout, *, doc_id: str, source_hash: str) -> bool:
     return row is not None
 
 
+def source_hashes(layout: Layout, *, doc_id: str) -> set[str]:
+    """All source hashes indexed for one doc; lets importers check rows in memory, not per query."""
+    ensure_index_schema(layout.index_db_path)
+    with _session(layout.index_db_path) as conn:
+        rows = conn.execute(
+            "SELECT source_hash FROM transactions WHERE source_doc_id = ? AND source_hash IS NOT NULL",
+            (doc_id,),
+        ).fetchall()
+    return {r[0] for r in rows}
+
+
 def recent_transactions(layout: Layout, *, limit: int, include_deleted: bool = False) -> list[dict[str, Any]]:
     ensure_index_schema(layout.index_db_path)
     where = "" if include_deleted else "WHERE is_deleted = 0"
@@ -372,8 +429,7 @@ def recent_transactions(layout: Layout, *, limit: int, include_deleted: bool = F
             SELECT raw_json
             FROM transactions
             {where}
-            ORDER BY COALESCE(occurred_at, ''), COALESCE(updated_at, '')
-            DESC
+            ORDER BY occurred_at DESC, updated_at DESC
             LIMIT ?
             """,
             (limit,),
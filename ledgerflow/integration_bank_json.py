@@ -1,18 +1,25 @@
 from __future__ import annotations
 
 import json
+import re
 from decimal import Decimal, InvalidOperation
 from pathlib import Path
 from typing import Any
 
 from .hashing import canonical_json_bytes, sha256_bytes
 from .ids import new_id
-from .index_db import has_source_hash
+from .index_db import source_hashes
 from .layout import Layout
 from .sources import register_file
-from .storage import append_jsonl
+from .storage import append_jsonl_many
 from .timeutil import parse_ymd, utc_now_iso
 
+_DATE_KEYS = ("occurredAt", "postedAt", "date", "bookingDate", "valueDate")
+_CURRENCY_KEYS = ("currency", "ccy")
+_MERCHANT_KEYS = ("merchant", "payee", "counterparty", "name")
+_DESCRIPTION_KEYS = ("description", "memo", "details", "narration")
+_CATEGORY_KEYS = ("category", "categoryId")
+
 
 def _path_get(obj: Any, path: str) -> Any:
     cur = obj
@@ -36,22 +43,39 @@ def _mapping_value(row: dict[str, Any], mapping: dict[str, str] | None, key: str
     return _path_get(row, path)
 
 
-def _pick_text(row: dict[str, Any], keys: list[str], default: str = "") -> str:
+def _pick_text(row: dict[str, Any], keys: tuple[str, ...], default: str = "") -> str:
     for key in keys:
-        if key in row and row.get(key) is not None:
-            v = str(row.get(key)).strip()
-            if v:
-                return v
+        v = row.get(key)
+        if v is not None:
+            s = str(v).strip()
+            if s:
+                return s
     return default
 
 
-def _parse_amount_value(value: Any) -> Decimal:
+# Plain decimals whose str(Decimal(s)) is s itself: no sign prefix, no leading zeros, and
+# few enough fraction digits that Decimal never switches to exponent notation.
+_PLAIN_DECIMAL = re.compile(r"-?(?:0|[1-9][0-9]*)(?:\.[0-9]{1,6})?")
+
+
+def _parse_amount_value(value: Any) -> tuple[str, bool]:
+    """
+    Return (canonical decimal text, is negative). Plain decimals are kept as written (sign
+    from the leading "-"); anything else ("+12.50", ".5", "1_000", ...) is normalized
+    through Decimal.
+    """
     if isinstance(value, dict):
         value = value.get("value")
+    s = str(value).strip()
+    if _PLAIN_DECIMAL.fullmatch(s):
+        return s, s[0] == "-" and s.strip("-0.") != ""
     try:
-        return Decimal(str(value).strip())
-    except (InvalidOperation, AttributeError) as e:
+        d = Decimal(s)
+    except InvalidOperation as e:
         raise ValueError(f"invalid amount value: {value!r}") from e
+    if not d.is_finite():
+        raise ValueError(f"invalid amount value: {value!r}")
+    return str(d), d < 0
 
 
 def _parse_records(path: str | Path) -> list[dict[str, Any]]:
@@ -80,7 +104,7 @@ def _row_to_tx(
 ) -> dict[str, Any]:
     occurred_at = str(_mapping_value(row, mapping, "date") or "").strip()
     if not occurred_at:
-        occurred_at = _pick_text(row, ["occurredAt", "postedAt", "date", "bookingDate", "valueDate"])
+        occurred_at = _pick_text(row, _DATE_KEYS)
     if not occurred_at:
         raise ValueError("missing date field (occurredAt|postedAt|date|bookingDate|valueDate)")
     parse_ymd(occurred_at)
@@ -88,27 +112,27 @@ def _row_to_tx(
     mapped_amount = _mapping_value(row, mapping, "amount")
     mapped_currency = _mapping_value(row, mapping, "currency")
     if mapped_amount is not None:
-        amount_value = _parse_amount_value(mapped_amount)
+        amount_value, negative = _parse_amount_value(mapped_amount)
         currency = str(mapped_currency or default_currency)
     else:
         amount_obj = row.get("amount")
         if isinstance(amount_obj, dict):
-            amount_value = _parse_amount_value(amount_obj.get("value"))
+            amount_value, negative = _parse_amount_value(amount_obj.get("value"))
             currency = str(amount_obj.get("currency") or default_currency)
         else:
-            amount_value = _parse_amount_value(row.get("amountValue", row.get("amount")))
-            currency = _pick_text(row, ["currency", "ccy"], default=default_currency)
+            amount_value, negative = _parse_amount_value(row.get("amountValue", row.get("amount")))
+            currency = _pick_text(row, _CURRENCY_KEYS, default=default_currency)
 
     merchant = str(_mapping_value(row, mapping, "merchant") or "").strip()
     if not merchant:
-        merchant = _pick_text(row, ["merchant", "payee", "counterparty", "name"])
+        merchant = _pick_text(row, _MERCHANT_KEYS)
     description = str(_mapping_value(row, mapping, "description") or "").strip()
     if not description:
-        description = _pick_text(row, ["description", "memo", "details", "narration"]) or merchant
+        description = _pick_text(row, _DESCRIPTION_KEYS) or merchant
     category_id = str(_mapping_value(row, mapping, "category") or "").strip()
     if not category_id:
-        category_id = _pick_text(row, ["category", "categoryId"], default="uncategorized")
-    direction = "debit" if amount_value < 0 else "credit"
+        category_id = _pick_text(row, _CATEGORY_KEYS, default="uncategorized")
+    direction = "debit" if negative else "credit"
 
     row_hash_obj = {
         "docId": doc_id,
@@ -127,7 +151,7 @@ def _row_to_tx(
         },
         "postedAt": occurred_at,
         "occurredAt": occurred_at,
-        "amount": {"value": str(amount_value), "currency": currency},
+        "amount": {"value": amount_value, "currency": currency},
         "direction": direction,
         "merchant": merchant,
         "description": description,
@@ -199,6 +223,9 @@ def import_bank_json_records(
     skipped = 0
     errors = 0
     samples: list[dict[str, Any]] = []
+    pending: list[dict[str, Any]] = []
+    # Hashes already imported for this doc, loaded once instead of queried per row.
+    existing = source_hashes(layout, doc_id=doc_id) if commit else set()
 
     for i, row in enumerate(rows, start=1):
         try:
@@ -216,15 +243,19 @@ def import_bank_json_records(
 
         if commit:
             h = str((tx.get("source") or {}).get("sourceHash") or "")
-            if has_source_hash(layout, doc_id=doc_id, source_hash=h):
+            if h in existing:
                 skipped += 1
                 continue
-            append_jsonl(layout.transactions_path, tx)
+            existing.add(h)
+            pending.append(tx)
             imported += 1
         else:
             if len(samples) < int(sample):
                 samples.append(tx)
 
+    # One write (and one index session) for the whole import instead of one per row.
+    append_jsonl_many(layout.transactions_path, pending)
+
     return {
         "mode": "commit" if commit else "dry-run",
         "docId": doc_id,
@@ -4,19 +4,51 @@ import json
 from pathlib import Path
 from typing import Any
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None  # type: ignore[assignment]
+
+
+def loads_json(raw: bytes | str) -> Any:
+    """
+    Decode one JSON document (or JSONL line). Uses orjson when installed and falls back to
+    stdlib json for anything orjson rejects (e.g. NaN, which json.dumps writes by default).
+    Raises ValueError (json.JSONDecodeError) for undecodable input.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except ValueError:
+            pass
+    return json.loads(raw)
+
+
+def dumps_json_line(obj: Any) -> bytes:
+    """
+    Encode one JSONL line (UTF-8, trailing newline). Uses orjson when installed and falls
+    back to stdlib json for anything orjson rejects (e.g. non-str keys, ints over 64 bits).
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+        except TypeError:
+            pass
+    return (json.dumps(obj, ensure_ascii=False) + "\n").encode("utf-8")
+
 
 def iter_jsonl(path: str | Path) -> Any:
     p = Path(path)
     if not p.exists():
         return
-    with p.open("r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
+    # Binary lines go straight to the decoder: no UTF-8 decode or strip() copy per line.
+    with p.open("rb") as f:
+        for raw in f:
+            if raw == b"\n" or not raw:
                 continue
             try:
-                obj = json.loads(line)
-            except json.JSONDecodeError:
+                obj = loads_json(raw)
+            except ValueError:
                 continue
             if isinstance(obj, dict):
                 yield obj
@@ -30,7 +62,7 @@ def read_jsonl(path: str | Path, *, limit: int | None = None) -> list[dict[str,
     p = Path(path)
     if not p.exists():
         return []
-    lines = p.read_text(encoding="utf-8").splitlines()
+    lines = p.read_bytes().splitlines()
     if limit is not None and limit >= 0:
         lines = lines[-limit:]
 
@@ -40,8 +72,8 @@ def read_jsonl(path: str | Path, *, limit: int | None = None) -> list[dict[str,
         if not line:
             continue
         try:
-            obj = json.loads(line)
-        except json.JSONDecodeError:
+            obj = loads_json(line)
+        except ValueError:
             continue
         if isinstance(obj, dict):
             out.append(obj)
@@ -1,112 +1,74 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Layout:
     data_dir: Path
 
-    @property
-    def inbox_dir(self) -> Path:
-        return self.data_dir / "inbox"
-
-    @property
-    def sources_dir(self) -> Path:
-        return self.data_dir / "sources"
-
-    @property
-    def sources_index_path(self) -> Path:
-        return self.sources_dir / "index.json"
-
-    @property
-    def ledger_dir(self) -> Path:
-        return self.data_dir / "ledger"
-
-    @property
-    def transactions_path(self) -> Path:
-        return self.ledger_dir / "transactions.jsonl"
-
-    @property
-    def corrections_path(self) -> Path:
-        return self.ledger_dir / "corrections.jsonl"
-
-    @property
-    def reports_dir(self) -> Path:
-        return self.data_dir / "reports"
-
-    @property
-    def charts_dir(self) -> Path:
-        return self.data_dir / "charts"
-
-    @property
-    def automation_dir(self) -> Path:
-        return self.data_dir / "automation"
-
-    @property
-    def automation_jobs_path(self) -> Path:
-        return self.automation_dir / "jobs.json"
-
-    @property
-    def automation_state_path(self) -> Path:
-        return self.automation_dir / "state.json"
-
-    @property
-    def automation_queue_path(self) -> Path:
-        return self.automation_dir / "queue.json"
-
-    @property
-    def automation_dead_letters_path(self) -> Path:
-        return self.automation_dir / "dead_letters.jsonl"
-
-    @property
-    def alerts_dir(self) -> Path:
-        return self.data_dir / "alerts"
-
-    @property
-    def alert_rules_path(self) -> Path:
-        return self.alerts_dir / "alert_rules.json"
-
-    @property
-    def alert_delivery_rules_path(self) -> Path:
-        return self.alerts_dir / "delivery_rules.json"
-
-    @property
-    def alert_delivery_state_path(self) -> Path:
-        return self.alerts_dir / "delivery_state.json"
-
-    @property
-    def alert_outbox_path(self) -> Path:
-        return self.alerts_dir / "outbox.jsonl"
-
-    @property
-    def rules_dir(self) -> Path:
-        return self.data_dir / "rules"
-
-    @property
-    def categories_path(self) -> Path:
-        return self.rules_dir / "categories.json"
-
-    @property
-    def index_dir(self) -> Path:
-        return self.data_dir / "index"
-
-    @property
-    def index_db_path(self) -> Path:
-        return self.index_dir / "ledgerflow.db"
-
-    @property
-    def meta_dir(self) -> Path:
-        return self.data_dir / "meta"
-
-    @property
-    def schema_state_path(self) -> Path:
-        return self.meta_dir / "schema.json"
-
-    @property
-    def audit_log_path(self) -> Path:
-        return self.meta_dir / "audit.jsonl"
+    # Derived paths are computed once here; callers hit them on every hook/index call.
+    inbox_dir: Path = field(init=False, repr=False, compare=False)
+    sources_dir: Path = field(init=False, repr=False, compare=False)
+    sources_index_path: Path = field(init=False, repr=False, compare=False)
+    ledger_dir: Path = field(init=False, repr=False, compare=False)
+    transactions_path: Path = field(init=False, repr=False, compare=False)
+    corrections_path: Path = field(init=False, repr=False, compare=False)
+    reports_dir: Path = field(init=False, repr=False, compare=False)
+    charts_dir: Path = field(init=False, repr=False, compare=False)
+    automation_dir: Path = field(init=False, repr=False, compare=False)
+    automation_jobs_path: Path = field(init=False, repr=False, compare=False)
+    automation_state_path: Path = field(init=False, repr=False, compare=False)
+    automation_queue_path: Path = field(init=False, repr=False, compare=False)
+    automation_dead_letters_path: Path = field(init=False, repr=False, compare=False)
+    alerts_dir: Path = field(init=False, repr=False, compare=False)
+    alert_rules_path: Path = field(init=False, repr=False, compare=False)
+    alert_delivery_rules_path: Path = field(init=False, repr=False, compare=False)
+    alert_delivery_state_path: Path = field(init=False, repr=False, compare=False)
+    alert_outbox_path: Path = field(init=False, repr=False, compare=False)
+    rules_dir: Path = field(init=False, repr=False, compare=False)
+    categories_path: Path = field(init=False, repr=False, compare=False)
+    index_dir: Path = field(init=False, repr=False, compare=False)
+    index_db_path: Path = field(init=False, repr=False, compare=False)
+    ledger_cache_path: Path = field(init=False, repr=False, compare=False)
+    review_cache_path: Path = field(init=False, repr=False, compare=False)
+    meta_dir: Path = field(init=False, repr=False, compare=False)
+    schema_state_path: Path = field(init=False, repr=False, compare=False)
+    audit_log_path: Path = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        def _set(name: str, value: Path) -> None:
+            object.__setattr__(self, name, value)
+
+        d = self.data_dir
+        _set("inbox_dir", d / "inbox")
+        _set("sources_dir", d / "sources")
+        _set("sources_index_path", self.sources_dir / "index.json")
+        _set("ledger_dir", d / "ledger")
+        _set("transactions_path", self.ledger_dir / "transactions.jsonl")
+        _set("corrections_path", self.ledger_dir / "corrections.jsonl")
+        _set("reports_dir", d / "reports")
+        _set("charts_dir", d / "charts")
+        _set("automation_dir", d / "automation")
+        _set("automation_jobs_path", self.automation_dir / "jobs.json")
+        _set("automation_state_path", self.automation_dir / "state.json")
+        _set("automation_queue_path", self.automation_dir / "queue.json")
+        _set("automation_dead_letters_path", self.automation_dir / "dead_letters.jsonl")
+        _set("alerts_dir", d / "alerts")
+        _set("alert_rules_path", self.alerts_dir / "alert_rules.json")
+        _set("alert_delivery_rules_path", self.alerts_dir / "delivery_rules.json")
+        _set("alert_delivery_state_path", self.alerts_dir / "delivery_state.json")
+        _set("alert_outbox_path", self.alerts_dir / "outbox.jsonl")
+        _set("rules_dir", d / "rules")
+        _set("categories_path", self.rules_dir / "categories.json")
+        _set("index_dir", d / "index")
+        _set("index_db_path", self.index_dir / "ledgerflow.db")
+        _set("ledger_cache_path", self.index_dir / "ledger.cache")
+        _set("review_cache_path", self.index_dir / "review.cache")
+        _set("meta_dir", d / "meta")
+        _set("schema_state_path", self.meta_dir / "schema.json")
+        _set("audit_log_path", self.meta_dir / "audit.jsonl")
 
 
 def layout_for(data_dir: str | Path) -> Layout:
@@ -1,8 +1,12 @@
 from __future__ import annotations
 
-import copy
+import marshal
+import os
+import threading
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass
-from typing import Any, Iterable
+from pathlib import Path
+from typing import Any
 
 from .jsonl import iter_jsonl
 from .layout import Layout
@@ -11,10 +15,35 @@ from .txutil import tx_date, tx_month
 
 def deep_merge_inplace(dst: dict[str, Any], patch: dict[str, Any]) -> None:
     for k, v in patch.items():
-        if isinstance(v, dict) and isinstance(dst.get(k), dict):
-            deep_merge_inplace(dst[k], v)  # type: ignore[index]
-        else:
-            dst[k] = v
+        if type(v) is dict:
+            sub = dst.get(k)
+            if type(sub) is dict:
+                deep_merge_inplace(sub, v)
+                continue
+        dst[k] = v
+
+
+def _apply_patch(dst: dict[str, Any], patch: dict[str, Any]) -> None:
+    """
+    deep_merge_inplace with the first level unrolled. Correction patches (links, tags,
+    merchant, category) are at most one level deep, so nested dicts merge via dict.update.
+    """
+    for k, v in patch.items():
+        if type(v) is dict:
+            sub = dst.get(k)
+            if type(sub) is dict:
+                if any(type(x) is dict for x in v.values()):
+                    deep_merge_inplace(sub, v)
+                else:
+                    sub.update(v)
+                continue
+        dst[k] = v
+
+
+def _clone_dicts(d: dict[str, Any]) -> dict[str, Any]:
+    # deep_merge_inplace only mutates dicts (lists and scalars are replaced), so copying the
+    # dict skeleton is enough to keep a patched tx from writing through to its source.
+    return {k: (_clone_dicts(v) if type(v) is dict else v) for k, v in d.items()}
 
 
 @dataclass(frozen=True)
@@ -38,16 +67,22 @@ def apply_corrections(
     *,
     include_deleted: bool = False,
 ) -> LedgerView:
+    if not corrections:
+        # Nothing to replay: keep txs with a usable txId, no id map needed.
+        kept = [tx for tx in transactions if (tx_id := tx.get("txId")) and isinstance(tx_id, str)]
+        return LedgerView(transactions=kept, deleted_tx_ids=set(), applied_corrections=0)
+
     # Keep original order, but apply corrections by txId deterministically in event order.
+    # Input dicts are shared until a patch touches them; patched txs are copied first.
     tx_list: list[dict[str, Any]] = []
-    tx_by_id: dict[str, dict[str, Any]] = {}
+    pos_by_id: dict[str, int] = {}
     for tx in transactions:
         tx_id = tx.get("txId")
         if not isinstance(tx_id, str) or not tx_id:
             continue
-        tx_copy = copy.deepcopy(tx)
-        tx_list.append(tx_copy)
-        tx_by_id[tx_id] = tx_copy
+        pos_by_id[tx_id] = len(tx_list)
+        tx_list.append(tx)
+    copied: set[str] = set()
 
     deleted: set[str] = set()
     applied = 0
@@ -56,14 +91,18 @@ def apply_corrections(
         tx_id = evt.get("txId")
         if not isinstance(tx_id, str) or not tx_id:
             continue
-        if tx_id not in tx_by_id:
+        if tx_id not in pos_by_id:
             continue
 
         evt_type = str(evt.get("type") or "patch")
         if evt_type == "patch":
             patch = evt.get("patch")
             if isinstance(patch, dict) and patch:
-                deep_merge_inplace(tx_by_id[tx_id], patch)
+                pos = pos_by_id[tx_id]
+                if tx_id not in copied:
+                    copied.add(tx_id)
+                    tx_list[pos] = _clone_dicts(tx_list[pos])
+                _apply_patch(tx_list[pos], patch)
                 applied += 1
         elif evt_type in ("tombstone", "delete"):
             deleted.add(tx_id)
@@ -72,11 +111,72 @@ def apply_corrections(
             # Unknown correction type: ignore (forward-compatible).
             continue
 
-    if include_deleted:
-        return LedgerView(transactions=tx_list, deleted_tx_ids=deleted, applied_corrections=applied)
-
-    filtered = [tx for tx in tx_list if str(tx.get("txId") or "") not in deleted]
-    return LedgerView(transactions=filtered, deleted_tx_ids=deleted, applied_corrections=applied)
+    view = LedgerView(transactions=tx_list, deleted_tx_ids=deleted, applied_corrections=applied)
+    return view if include_deleted else _without_deleted(view)
+
+
+def _without_deleted(view: LedgerView) -> LedgerView:
+    deleted = view.deleted_tx_ids
+    if not deleted:
+        return view
+    filtered = [tx for tx in view.transactions if str(tx.get("txId") or "") not in deleted]
+    return LedgerView(transactions=filtered, deleted_tx_ids=deleted, applied_corrections=view.applied_corrections)
+
+
+# Compiled-ledger cache: the corrected view (deleted txs included) stored next to the sqlite
+# index and keyed by the stat of both JSONL logs. marshal keeps load fast without pickle's
+# arbitrary-object loading; any mismatch or unreadable file just means a rebuild.
+_LEDGER_CACHE_VERSION = 1
+
+
+def _file_key(path: Path) -> tuple[int, int, int] | None:
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def _read_ledger_cache(path: Path, key: tuple[Any, ...]) -> LedgerView | None:
+    try:
+        data = marshal.loads(path.read_bytes())
+    except (OSError, EOFError, ValueError, TypeError, MemoryError):
+        # MemoryError is what marshal raises for a corrupt length field; every failure is a
+        # miss so the next build overwrites the file.
+        return None
+    if not isinstance(data, tuple) or len(data) != 5 or data[0] != _LEDGER_CACHE_VERSION or data[1] != key:
+        return None
+    return LedgerView(transactions=data[2], deleted_tx_ids=data[3], applied_corrections=data[4])
+
+
+def _write_ledger_cache(path: Path, key: tuple[Any, ...], view: LedgerView) -> None:
+    payload = (_LEDGER_CACHE_VERSION, key, view.transactions, view.deleted_tx_ids, view.applied_corrections)
+    # Per thread, not just per process: server threads may rebuild concurrently.
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp.write_bytes(marshal.dumps(payload))
+        os.replace(tmp, path)
+    except (OSError, ValueError):
+        # Best-effort: the JSONL logs remain the source of truth.
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+
+
+def _compiled_view(layout: Layout) -> LedgerView:
+    # Stat before reading: if a log grows mid-load, the stored key is older than the data
+    # and the next load rebuilds instead of serving a stale view.
+    key = (_file_key(layout.transactions_path), _file_key(layout.corrections_path))
+    view = _read_ledger_cache(layout.ledger_cache_path, key)
+    if view is None:
+        txs = load_transactions_raw(layout)
+        evts = load_corrections_raw(layout)
+        view = apply_corrections(txs, evts, include_deleted=True)
+        if key != (None, None):
+            _write_ledger_cache(layout.ledger_cache_path, key, view)
+    return view
 
 
 def load_ledger(
@@ -84,9 +184,28 @@ def load_ledger(
     *,
     include_deleted: bool = False,
 ) -> LedgerView:
-    txs = load_transactions_raw(layout)
-    evts = load_corrections_raw(layout)
-    return apply_corrections(txs, evts, include_deleted=include_deleted)
+    view = _compiled_view(layout)
+    return view if include_deleted else _without_deleted(view)
+
+
+def iter_ledger(
+    layout: Layout,
+    *,
+    include_deleted: bool = False,
+    date: str | None = None,
+) -> Iterator[dict[str, Any]]:
+    """
+    Same txs as load_ledger(...).transactions, yielded one at a time so callers that stop
+    early or only count never build the filtered list. With `date`, only txs on that day.
+    """
+    view = _compiled_view(layout)
+    txs: Iterable[dict[str, Any]] = view.transactions
+    if date:
+        txs = (tx for tx in txs if tx_date(tx) == date)
+    deleted = set() if include_deleted else view.deleted_tx_ids
+    if deleted:
+        txs = (tx for tx in txs if str(tx.get("txId") or "") not in deleted)
+    return iter(txs)
 
 
 def filter_by_date_range(
@@ -95,24 +214,34 @@ def filter_by_date_range(
     from_date: str | None,
     to_date: str | None,
 ) -> list[dict[str, Any]]:
-    out: list[dict[str, Any]] = []
-    for tx in txs:
-        d = tx_date(tx)
-        if not d:
-            continue
-        if from_date and d < from_date:
-            continue
-        if to_date and d > to_date:
-            continue
-        out.append(tx)
-    return out
+    # One comprehension per bound combination so the per-tx work is a single date lookup
+    # plus the comparisons that actually apply.
+    dated = ((tx_date(tx), tx) for tx in txs)
+    if from_date and to_date:
+        return [tx for d, tx in dated if d and from_date <= d <= to_date]
+    if from_date:
+        return [tx for d, tx in dated if d and d >= from_date]
+    if to_date:
+        return [tx for d, tx in dated if d and d <= to_date]
+    return [tx for d, tx in dated if d]
 
 
 def filter_by_month(txs: Iterable[dict[str, Any]], month: str) -> list[dict[str, Any]]:
-    out: list[dict[str, Any]] = []
+    if len(month) == 7:
+        # Same as tx_month(tx) == month: shorter dates can never equal a 7-char month.
+        return [tx for tx in txs if tx_date(tx)[:7] == month]
+    return [tx for tx in txs if tx_month(tx) == month]
+
+
+def group_by_month(txs: Iterable[dict[str, Any]]) -> dict[str, list[dict[str, Any]]]:
+    """Bucket txs by "YYYY-MM" in one pass; each bucket equals filter_by_month for that month."""
+    out: dict[str, list[dict[str, Any]]] = {}
     for tx in txs:
-        m = tx_month(tx)
-        if m == month:
-            out.append(tx)
+        mo = tx_month(tx)
+        if mo:
+            bucket = out.get(mo)
+            if bucket is None:
+                out[mo] = [tx]
+            else:
+                bucket.append(tx)
     return out
-
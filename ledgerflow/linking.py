@@ -1,40 +1,61 @@
 from __future__ import annotations
 
-import re
-from datetime import datetime
-from decimal import Decimal
-from pathlib import Path
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from decimal import ROUND_CEILING, ROUND_FLOOR, Decimal
+from functools import lru_cache
 from typing import Any
 
 from .ids import new_id
 from .layout import Layout
 from .ledger import load_ledger
 from .money import decimal_from_any
-from .storage import append_jsonl, read_json
+from .sources import index_docs
+from .storage import append_jsonl_many, read_json
 from .timeutil import utc_now_iso
-from .txutil import tx_amount_decimal, tx_currency, tx_date, tx_merchant, tx_source_type
+from .txutil import tx_amount_decimal, tx_currency, tx_date, tx_merchant, tx_source_type, ymd_ordinal
+
+
+class _NormTable(dict):
+    # str.translate table: a-z/0-9 map to themselves, every other code point to a space.
+    def __missing__(self, cp: int) -> int | str:
+        out: int | str = cp if (97 <= cp <= 122 or 48 <= cp <= 57) else " "
+        self[cp] = out
+        return out
+
+
+_NORM_TABLE = _NormTable()
 
 
 def _norm_text(s: str) -> str:
-    return re.sub(r"[^a-z0-9]+", " ", s.lower()).strip()
+    return " ".join(s.lower().translate(_NORM_TABLE).split())
+
+
+@lru_cache(maxsize=4096)
+def _tokens(norm: str) -> frozenset[str]:
+    return frozenset(norm.split())
 
 
 def _merchant_score(a: str, b: str) -> float:
-    aa = _norm_text(a)
-    bb = _norm_text(b)
+    return _norm_merchant_score(_norm_text(a), _norm_text(b))
+
+
+def _norm_merchant_score(aa: str, bb: str) -> float:
+    """_merchant_score for strings already passed through _norm_text."""
     if not aa or not bb:
         return 0.0
     if aa == bb:
         return 1.0
     if aa in bb or bb in aa:
         return 0.8
-    ta = set(aa.split())
-    tb = set(bb.split())
+    ta = _tokens(aa)
+    tb = _tokens(bb)
     if not ta or not tb:
         return 0.0
-    inter = len(ta & tb)
-    union = len(ta | tb)
-    return inter / union
+    if len(ta) > len(tb):
+        ta, tb = tb, ta
+    inter = sum(1 for t in ta if t in tb)
+    return inter / (len(ta) + len(tb) - inter)
 
 
 def _already_linked_receipts(txs: list[dict[str, Any]]) -> set[str]:
@@ -80,54 +101,128 @@ def _candidate_bank_txs(txs: list[dict[str, Any]], *, skip_link_fields: list[str
     return out
 
 
-def _load_receipt_docs(layout: Layout) -> list[dict[str, Any]]:
-    idx = read_json(layout.sources_index_path, {"version": 1, "docs": []})
-    docs = idx.get("docs", [])
-    if not isinstance(docs, list):
-        return []
-    out = []
-    for d in docs:
-        if not isinstance(d, dict):
-            continue
-        if str(d.get("sourceType") or "") != "receipt":
-            continue
-        doc_id = str(d.get("docId") or "")
-        if not doc_id:
+def _cents(value: Decimal, rounding: str = ROUND_FLOOR) -> int:
+    return int((value * 100).to_integral_value(rounding=rounding))
+
+
+def _exact_cents(value: Decimal) -> int | None:
+    """Integer cents when value has at most two decimals, else None."""
+    c = value * 100
+    i = c.to_integral_value()
+    return int(i) if i == c else None
+
+
+# (position in bank_txs, tx, outflow amount, exact outflow cents or None, currency,
+# normalized merchant), parsed once per run and bucketed by date ordinal, then floor cents of
+# the outflow.
+_BankEntry = tuple[int, dict[str, Any], Decimal, int | None, str, str]
+_BankIndex = dict[int, dict[int, list[_BankEntry]]]
+
+
+def _index_bank_txs(bank_txs: list[dict[str, Any]]) -> _BankIndex:
+    index: _BankIndex = defaultdict(lambda: defaultdict(list))
+    for pos, tx in enumerate(bank_txs):
+        d_ord = ymd_ordinal(tx_date(tx))
+        if d_ord is None:
             continue
-        parse_path = layout.sources_dir / doc_id / "parse.json"
-        if not parse_path.exists():
+        try:
+            amt = tx_amount_decimal(tx)
+        except (ValueError, TypeError):
             continue
-        parsed = read_json(parse_path, {})
-        if not isinstance(parsed, dict):
+        if not amt.is_finite() or amt >= 0:
             continue
-        out.append({"doc": d, "parse": parsed})
-    return out
+        out_amt = -amt
+        entry = (pos, tx, out_amt, _exact_cents(out_amt), tx_currency(tx), _norm_text(tx_merchant(tx)))
+        index[d_ord][_cents(out_amt)].append(entry)
+    # Plain dicts from here on so probing never inserts empty buckets.
+    return {d_ord: dict(by_cents) for d_ord, by_cents in index.items()}
 
 
-def _load_bill_docs(layout: Layout) -> list[dict[str, Any]]:
-    idx = read_json(layout.sources_index_path, {"version": 1, "docs": []})
-    docs = idx.get("docs", [])
-    if not isinstance(docs, list):
-        return []
+def _bank_candidates(
+    index: _BankIndex,
+    *,
+    day: int,
+    amount: Decimal,
+    tol: Decimal,
+    max_days_diff: int,
+    ccy: str,
+) -> list[_BankEntry]:
+    """
+    Bank txs within max_days_diff days and tol of amount, in original bank_txs order.
+
+    Buckets hold whole cents, so the tolerance is re-checked per candidate: in integer cents
+    when all three values are whole cents (the usual case), otherwise in Decimal.
+    """
+    lo_c = _cents(amount - tol)
+    hi_c = _cents(amount + tol, ROUND_CEILING)
+    amount_c = _exact_cents(amount)
+    tol_c = _exact_cents(tol)
+    int_ok = amount_c is not None and tol_c is not None
     out = []
-    for d in docs:
-        if not isinstance(d, dict):
-            continue
-        if str(d.get("sourceType") or "") != "bill":
+    n_cents = hi_c - lo_c + 1
+    buckets: list[list[_BankEntry]] = []
+    for d_ord in range(day - max_days_diff, day + max_days_diff + 1):
+        by_cents = index.get(d_ord)
+        if not by_cents:
             continue
-        doc_id = str(d.get("docId") or "")
-        if not doc_id:
-            continue
-        parse_path = layout.sources_dir / doc_id / "parse.json"
-        if not parse_path.exists():
-            continue
-        parsed = read_json(parse_path, {})
-        if not isinstance(parsed, dict):
-            continue
-        out.append({"doc": d, "parse": parsed})
+        if n_cents > len(by_cents):
+            # Wide tolerance: walking the day's buckets is cheaper than probing every cent.
+            buckets.extend(entries for c, entries in by_cents.items() if lo_c <= c <= hi_c)
+        else:
+            for c in range(lo_c, hi_c + 1):
+                entries = by_cents.get(c)
+                if entries:
+                    buckets.append(entries)
+    for entries in buckets:
+        for entry in entries:
+            # Currency is a plain string compare; reject on it before the amount check.
+            if ccy and entry[4] and entry[4] != ccy:
+                continue
+            if int_ok and entry[3] is not None:
+                if abs(entry[3] - amount_c) > tol_c:  # type: ignore[operator]
+                    continue
+            elif abs(entry[2] - amount) > tol:
+                continue
+            out.append(entry)
+    out.sort(key=lambda e: e[0])
     return out
 
 
+# parse.json reads are independent small-file I/O; below this many docs a pool isn't worth it.
+_DOC_LOAD_PARALLEL_MIN = 8
+_DOC_LOAD_MAX_WORKERS = 16
+
+
+def _load_doc_parse(layout: Layout, d: dict[str, Any]) -> dict[str, Any] | None:
+    doc_id = str(d.get("docId") or "")
+    if not doc_id:
+        return None
+    # read_json returns the default for a missing file: one open, no separate exists() stat.
+    parsed = read_json(layout.sources_dir / doc_id / "parse.json", None)
+    if not isinstance(parsed, dict):
+        return None
+    return {"doc": d, "parse": parsed}
+
+
+def _load_docs(layout: Layout, source_type: str) -> list[dict[str, Any]]:
+    docs = index_docs(layout.sources_index_path)
+    wanted = [d for d in docs if isinstance(d, dict) and str(d.get("sourceType") or "") == source_type]
+    if len(wanted) < _DOC_LOAD_PARALLEL_MIN:
+        loaded = [_load_doc_parse(layout, d) for d in wanted]
+    else:
+        with ThreadPoolExecutor(max_workers=min(_DOC_LOAD_MAX_WORKERS, len(wanted))) as ex:
+            loaded = list(ex.map(lambda d: _load_doc_parse(layout, d), wanted))
+    return [item for item in loaded if item is not None]
+
+
+def _load_receipt_docs(layout: Layout) -> list[dict[str, Any]]:
+    return _load_docs(layout, "receipt")
+
+
+def _load_bill_docs(layout: Layout) -> list[dict[str, Any]]:
+    return _load_docs(layout, "bill")
+
+
 def link_receipts_to_bank(
     layout: Layout,
     *,
@@ -140,6 +235,7 @@ def link_receipts_to_bank(
 
     linked_receipts = _already_linked_receipts(txs)
     bank_txs = _candidate_bank_txs(txs, skip_link_fields=["receiptDocId"])
+    bank_index = _index_bank_txs(bank_txs)
 
     tol = decimal_from_any(amount_tolerance)
     receipts = _load_receipt_docs(layout)
@@ -147,6 +243,7 @@ def link_receipts_to_bank(
     created = 0
     skipped = 0
     attempted = 0
+    pending: list[dict[str, Any]] = []
 
     for item in receipts:
         doc = item["doc"]
@@ -163,43 +260,28 @@ def link_receipts_to_bank(
         if not r_date or not isinstance(r_total, dict):
             continue
 
-        try:
-            rd = datetime.strptime(r_date, "%Y-%m-%d").date()
-        except ValueError:
+        rd = ymd_ordinal(r_date)
+        if rd is None:
             continue
 
         try:
             total = decimal_from_any(r_total.get("value"))
         except Exception:
             continue
+        if not total.is_finite():
+            continue
 
         ccy = str(r_total.get("currency") or "")
         merchant = str(parsed.get("merchant") or "").strip()
+        merchant_norm = _norm_text(merchant)
 
         best = None
         best_score = -1.0
-        for tx in bank_txs:
-            td_s = tx_date(tx)
-            if not td_s:
-                continue
-            try:
-                td = datetime.strptime(td_s, "%Y-%m-%d").date()
-            except ValueError:
-                continue
-            if abs((td - rd).days) > max_days_diff:
-                continue
-
-            if ccy and tx_currency(tx) and tx_currency(tx) != ccy:
-                continue
-
-            amt = tx_amount_decimal(tx)
-            if amt >= 0:
-                continue
-            if abs((-amt) - total) > tol:
-                continue
-
+        for _, tx, _amt, _amt_c, _ccy, tx_merch_norm in _bank_candidates(
+            bank_index, day=rd, amount=total, tol=tol, max_days_diff=max_days_diff, ccy=ccy
+        ):
             score = 0.5  # base score for date+amount match
-            score += _merchant_score(merchant, tx_merchant(tx)) * 0.5
+            score += _norm_merchant_score(merchant_norm, tx_merch_norm) * 0.5
             if score > best_score:
                 best_score = score
                 best = tx
@@ -232,10 +314,13 @@ def link_receipts_to_bank(
         }
 
         if commit:
-            append_jsonl(layout.corrections_path, evt)
+            pending.append(evt)
             created += 1
             linked_receipts.add(doc_id)
 
+    # One write for the whole run.
+    append_jsonl_many(layout.corrections_path, pending)
+
     return {"attempted": attempted, "created": created, "skipped": skipped, "commit": commit}
 
 
@@ -251,12 +336,14 @@ def link_bills_to_bank(
 
     linked_bills = _already_linked_bills(txs)
     bank_txs = _candidate_bank_txs(txs, skip_link_fields=["billDocId"])
+    bank_index = _index_bank_txs(bank_txs)
     tol = decimal_from_any(amount_tolerance)
     bills = _load_bill_docs(layout)
 
     created = 0
     skipped = 0
     attempted = 0
+    pending: list[dict[str, Any]] = []
 
     for item in bills:
         doc = item["doc"]
@@ -275,37 +362,26 @@ def link_bills_to_bank(
             amount = decimal_from_any(amt_obj.get("value"))
         except Exception:
             continue
+        if not amount.is_finite():
+            continue
         ccy = str(amt_obj.get("currency") or "")
 
         vendor = str(parsed.get("vendor") or "").strip()
         anchor = str(parsed.get("dueDate") or parsed.get("date") or "")
         if not anchor:
             continue
-        try:
-            ad = datetime.strptime(anchor, "%Y-%m-%d").date()
-        except ValueError:
+        ad = ymd_ordinal(anchor)
+        if ad is None:
             continue
 
+        vendor_norm = _norm_text(vendor)
+
         best = None
         best_score = -1.0
-        for tx in bank_txs:
-            td_s = tx_date(tx)
-            if not td_s:
-                continue
-            try:
-                td = datetime.strptime(td_s, "%Y-%m-%d").date()
-            except ValueError:
-                continue
-            if abs((td - ad).days) > max_days_diff:
-                continue
-            if ccy and tx_currency(tx) and tx_currency(tx) != ccy:
-                continue
-            tamt = tx_amount_decimal(tx)
-            if tamt >= 0:
-                continue
-            if abs((-tamt) - amount) > tol:
-                continue
-            score = 0.5 + 0.5 * _merchant_score(vendor, tx_merchant(tx))
+        for _, tx, _amt, _amt_c, _ccy, tx_merch_norm in _bank_candidates(
+            bank_index, day=ad, amount=amount, tol=tol, max_days_diff=max_days_diff, ccy=ccy
+        ):
+            score = 0.5 + 0.5 * _norm_merchant_score(vendor_norm, tx_merch_norm)
             if score > best_score:
                 best_score = score
                 best = tx
@@ -326,8 +402,10 @@ def link_bills_to_bank(
             "at": utc_now_iso(),
         }
         if commit:
-            append_jsonl(layout.corrections_path, evt)
+            pending.append(evt)
             created += 1
             linked_bills.add(doc_id)
 
+    append_jsonl_many(layout.corrections_path, pending)
+
     return {"attempted": attempted, "created": created, "skipped": skipped, "commit": commit}
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import re
 from pathlib import Path
 from typing import Any
 
@@ -9,15 +10,32 @@ from .layout import Layout
 from .storage import read_json
 from .timeutil import utc_now_iso
 
+_COUNT_CHUNK = 1 << 20
+_RE_BLANK_LINE = re.compile(rb"^[ \t\r\f\v]*\n", re.MULTILINE)
+
 
 def _count_jsonl(path: Path) -> int:
-    if not path.exists():
+    # Count non-blank lines: newlines are counted per chunk in C, then the (rare) blank lines
+    # are subtracted. Chunks are cut after their last newline so every buffer starts a line;
+    # the unfinished line's pieces are kept in a list so a very long line is joined once.
+    try:
+        f = path.open("rb")
+    except FileNotFoundError:
         return 0
     count = 0
-    with path.open("r", encoding="utf-8") as f:
-        for line in f:
-            if line.strip():
-                count += 1
+    pending: list[bytes] = []
+    with f:
+        while chunk := f.read(_COUNT_CHUNK):
+            cut = chunk.rfind(b"\n") + 1
+            if not cut:
+                pending.append(chunk)
+                continue
+            pending.append(chunk[:cut])
+            buf = b"".join(pending)
+            pending = [chunk[cut:]]
+            count += buf.count(b"\n") - sum(1 for _ in _RE_BLANK_LINE.finditer(buf))
+    if any(piece.strip() for piece in pending):
+        count += 1
     return count
 
 
@@ -10,68 +10,105 @@ from .csv_import import parse_amount_text
 from .money import fmt_decimal
 
 
-_RE_DATE_ISO = re.compile(r"\b(20\d{2})[-/](\d{1,2})[-/](\d{1,2})\b")
-_RE_DATE_SLASH = re.compile(r"\b(\d{1,2})/(\d{1,2})/(20\d{2})\b")
-_RE_DATE_DOT = re.compile(r"\b(\d{1,2})\.(\d{1,2})\.(20\d{2})\b")
+# ISO gets its own search: a combined finditer consumes text, so an ISO date overlapping an
+# earlier DOT/SLASH candidate ("12/01/2026-05-06") would never be tried. DOT and SLASH
+# matches cannot overlap each other, so one pass finds the first of each.
+# The outer named group closes last, so Match.lastgroup names the format.
+_RE_DATE_ISO = re.compile(r"\b(?P<iso>(?P<iy>20\d{2})[-/](?P<im>\d{1,2})[-/](?P<id>\d{1,2}))\b")
+_RE_DATE_DOT_SLASH = re.compile(
+    r"\b(?:(?P<dot>(?P<dd>\d{1,2})\.(?P<dm>\d{1,2})\.(?P<dy>20\d{2}))"
+    r"|(?P<slash>(?P<sm>\d{1,2})/(?P<sd>\d{1,2})/(?P<sy>20\d{2})))\b"
+)
+# Format -> (year, month, day) group names. SLASH assumes MM/DD/YYYY (common in US exports).
+_DATE_PARTS = {"iso": ("iy", "im", "id"), "dot": ("dy", "dm", "dd"), "slash": ("sy", "sm", "sd")}
 
 
-def _first_date(text: str) -> str | None:
-    m = _RE_DATE_ISO.search(text)
-    if m:
-        y, mo, d = int(m.group(1)), int(m.group(2)), int(m.group(3))
-        try:
-            return datetime(y, mo, d).date().isoformat()
-        except ValueError:
-            pass
+def _ymd(m: re.Match[str]) -> str | None:
+    y, mo, d = m.group(*_DATE_PARTS[m.lastgroup or ""])
+    try:
+        return datetime(int(y), int(mo), int(d)).date().isoformat()
+    except ValueError:
+        return None
 
-    m = _RE_DATE_DOT.search(text)
-    if m:
-        d, mo, y = int(m.group(1)), int(m.group(2)), int(m.group(3))
-        try:
-            return datetime(y, mo, d).date().isoformat()
-        except ValueError:
-            pass
 
-    m = _RE_DATE_SLASH.search(text)
+def _first_date(text: str) -> str | None:
+    # Only the first match of each format is considered, as with separate searches.
+    m = _RE_DATE_ISO.search(text)
     if m:
-        # Heuristic: assume MM/DD/YYYY (common in US exports).
-        mo, d, y = int(m.group(1)), int(m.group(2)), int(m.group(3))
-        try:
-            return datetime(y, mo, d).date().isoformat()
-        except ValueError:
-            pass
+        out = _ymd(m)
+        if out:
+            return out
+    firsts: dict[str, re.Match[str]] = {}
+    for m in _RE_DATE_DOT_SLASH.finditer(text):
+        firsts.setdefault(m.lastgroup or "", m)
+        if len(firsts) == 2:
+            break
+    for kind in ("dot", "slash"):
+        first = firsts.get(kind)
+        if first:
+            out = _ymd(first)
+            if out:
+                return out
     return None
 
 
 _RE_MONEY = re.compile(
-    r"(?P<ccy>USD|EUR|GBP|INR|AUD|CAD|CHF|JPY|\$|€|£)?\s*(?P<amt>\(?-?\d[\d,]*\.\d{2}\)?-?)"
+    r"(?P<ccy>USD|EUR|GBP|INR|AUD|CAD|CHF|JPY|[$€£])?\s*(?P<amt>\(?-?\d[\d,]*\.\d{2}\)?-?)"
 )
 
 
+def _money_amount(raw: str) -> Decimal | None:
+    """
+    parse_amount_text for an _RE_MONEY "amt" group. The regex already guarantees digits with
+    two decimals, so the only unparseable shape is an unbalanced parenthesis.
+    """
+    negative = False
+    if raw[0] == "(":
+        if raw[-1] != ")":
+            return None
+        raw = raw[1:-1]
+        negative = True
+    elif ")" in raw:
+        return None
+    raw = raw.replace(",", "")
+    # Some exports use trailing minus: 12.34-
+    if raw[-1] == "-":
+        negative = True
+        raw = raw[:-1]
+    d = Decimal(raw)
+    return -d if negative else d
+
+
 def _find_money_candidates(line: str) -> list[tuple[str | None, Decimal]]:
+    # Every match needs a ".dd" tail; most OCR lines (names, addresses, dates) have no dot.
+    if "." not in line:
+        return []
     out = []
     for m in _RE_MONEY.finditer(line):
-        ccy = m.group("ccy")
-        raw_amt = m.group("amt")
-        try:
-            amt = parse_amount_text(raw_amt)
-        except Exception:
-            continue
-        out.append((ccy, amt))
+        amt = _money_amount(m.group("amt"))
+        if amt is not None:
+            out.append((m.group("ccy"), amt))
     return out
 
 
+# Line/keyword patterns used by the receipt and bill parsers, compiled once.
+_RE_ADDRESS_ONLY = re.compile(r"[0-9 ,.-]+")
+_RE_TOTAL_KW = re.compile(r"\b(total|grand total|amount due|balance due)\b", re.I)
+_RE_VAT = re.compile(r"\b(vat|tax)\b.*?(?P<rate>\d{1,2}(?:\.\d+)?)%.*?(?P<amt>\d[\d,]*\.\d{2})", re.I)
+_RE_AMOUNT_KW = re.compile(r"\b(amount due|total due|total)\b", re.I)
+_RE_DUE_DATE = re.compile(r"\b(due date|pay by)\b[: ]+(?P<d>.+)$", re.I | re.M)
+_RE_INVOICE_KW = re.compile(r"\b(invoice|bill)\s*(no|number)\b", re.I)
+_RE_INVOICE_NO = re.compile(r"\b(invoice|bill)\s*(no|number)\b[: ]+(?P<v>[A-Za-z0-9-]+)", re.I)
+
+_CCY_SYMBOLS = {"$": "USD", "€": "EUR", "£": "GBP"}
+
+
 def _normalize_currency(ccy: str | None, default_currency: str) -> str:
     if not ccy:
         return default_currency
-    c = ccy.strip().upper()
-    if c == "$":
-        return "USD"
-    if c == "€":
-        return "EUR"
-    if c == "£":
-        return "GBP"
-    return c
+    # _RE_MONEY yields either an upper-case ISO code or a symbol; only symbols need mapping.
+    c = ccy if len(ccy) == 3 and ccy.isupper() else ccy.strip().upper()
+    return _CCY_SYMBOLS.get(c, c)
 
 
 def _guess_merchant(lines: list[str]) -> str | None:
@@ -83,17 +120,18 @@ def _guess_merchant(lines: list[str]) -> str | None:
         if low in ("receipt", "tax invoice", "invoice", "thank you", "thanks"):
             continue
         # Skip lines that look like addresses only.
-        if re.fullmatch(r"[0-9 ,.-]+", s):
+        if _RE_ADDRESS_ONLY.fullmatch(s):
             continue
         return s[:80]
     return None
 
 
 def _receipt_template(lines: list[str]) -> str:
-    low_lines = [ln.lower() for ln in lines]
-    has_total = any("total" in ln for ln in low_lines)
-    has_vat = any(("vat" in ln or "tax" in ln) for ln in low_lines)
-    has_card = any(("card" in ln or "visa" in ln or "mastercard" in ln) for ln in low_lines)
+    # Keywords never contain "\n", so substring tests on the joined text match per-line tests.
+    blob = "\n".join(lines).lower()
+    has_total = "total" in blob
+    has_vat = "vat" in blob or "tax" in blob
+    has_card = "card" in blob or "visa" in blob or "mastercard" in blob
     if has_total and has_vat and has_card:
         return "retail_pos_with_vat_and_card"
     if has_total and has_vat:
@@ -104,10 +142,10 @@ def _receipt_template(lines: list[str]) -> str:
 
 
 def _bill_template(lines: list[str], text: str) -> str:
-    low_lines = [ln.lower() for ln in lines]
-    has_due = any(("due date" in ln or "pay by" in ln) for ln in low_lines)
-    has_invoice = bool(re.search(r"\b(invoice|bill)\s*(no|number)\b", text, re.I))
-    has_meter = any(("kwh" in ln or "usage" in ln or "meter" in ln) for ln in low_lines)
+    blob = "\n".join(lines).lower()
+    has_due = "due date" in blob or "pay by" in blob
+    has_invoice = bool(_RE_INVOICE_KW.search(text))
+    has_meter = "kwh" in blob or "usage" in blob or "meter" in blob
     if has_due and has_invoice and has_meter:
         return "utility_invoice"
     if has_due and has_invoice:
@@ -117,6 +155,26 @@ def _bill_template(lines: list[str], text: str) -> str:
     return "generic_bill"
 
 
+def _pick_amount_line(lines: list[str], keyword_re: re.Pattern[str]) -> tuple[str | None, Decimal] | None:
+    """
+    Largest-magnitude amount on the first keyword line that has one, else on the first line
+    with any amount. Single pass: only lines that could still matter are scanned for money.
+    """
+    fallback = None
+    for ln in lines:
+        is_kw = keyword_re.search(ln) is not None
+        if not is_kw and fallback is not None:
+            continue
+        cands = _find_money_candidates(ln)
+        if not cands:
+            continue
+        best = max(cands, key=lambda x: abs(x[1]))
+        if is_kw:
+            return best
+        fallback = best
+    return fallback
+
+
 def _score_to_two_decimals(v: float) -> float:
     return round(v, 2)
 
@@ -131,26 +189,17 @@ def parse_receipt_text(text: str, *, default_currency: str = "USD") -> dict[str,
     total_amt: Decimal | None = None
     total_ccy: str = default_currency
 
-    # Prefer lines with TOTAL keywords.
-    total_lines = [ln for ln in lines if re.search(r"\b(total|grand total|amount due|balance due)\b", ln, re.I)]
-    scan = total_lines + lines
-    for ln in scan:
-        cands = _find_money_candidates(ln)
-        if not cands:
-            continue
-        # Pick largest absolute value on the line.
-        ccy, amt = max(cands, key=lambda x: abs(x[1]))
-        if amt is None:
-            continue
+    # Prefer lines with TOTAL keywords; otherwise the first line with any amount.
+    picked = _pick_amount_line(lines, _RE_TOTAL_KW)
+    if picked is not None:
+        ccy, amt = picked
         # Receipts totals are typically positive in the document.
         total_amt = abs(amt)
         total_ccy = _normalize_currency(ccy, default_currency)
-        break
 
     vat = []
-    re_vat = re.compile(r"\b(vat|tax)\b.*?(?P<rate>\d{1,2}(?:\.\d+)?)%.*?(?P<amt>\d[\d,]*\.\d{2})", re.I)
     for ln in lines:
-        m = re_vat.search(ln)
+        m = _RE_VAT.search(ln)
         if not m:
             continue
         try:
@@ -198,27 +247,22 @@ def parse_bill_text(text: str, *, default_currency: str = "USD") -> dict[str, An
     date = _first_date(text)
 
     due_date = None
-    m = re.search(r"\b(due date|pay by)\b[: ]+(?P<d>.+)$", text, re.I | re.M)
+    m = _RE_DUE_DATE.search(text)
     if m:
         due_date = _first_date(m.group("d"))
 
     invoice_no = None
-    m = re.search(r"\b(invoice|bill)\s*(no|number)\b[: ]+(?P<v>[A-Za-z0-9-]+)", text, re.I)
+    m = _RE_INVOICE_NO.search(text)
     if m:
         invoice_no = m.group("v")
 
     amount_due: Decimal | None = None
     currency = default_currency
-    amount_lines = [ln for ln in lines if re.search(r"\b(amount due|total due|total)\b", ln, re.I)]
-    scan = amount_lines + lines
-    for ln in scan:
-        cands = _find_money_candidates(ln)
-        if not cands:
-            continue
-        ccy, amt = max(cands, key=lambda x: abs(x[1]))
+    picked = _pick_amount_line(lines, _RE_AMOUNT_KW)
+    if picked is not None:
+        ccy, amt = picked
         amount_due = abs(amt)
         currency = _normalize_currency(ccy, default_currency)
-        break
 
     confidence_breakdown = {
         "vendor": 0.25 if vendor else 0.0,
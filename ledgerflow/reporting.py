@@ -1,23 +1,52 @@
 from __future__ import annotations
 
 import calendar
+import heapq
 import re
+from bisect import bisect_left, bisect_right
 from collections import defaultdict
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from decimal import Decimal
+from decimal import ROUND_CEILING, ROUND_FLOOR, Decimal
+from functools import lru_cache
+from itertools import accumulate, chain, islice
+from operator import itemgetter
+from pathlib import Path
 from typing import Any
 
 from .alerts import alerts_for_date
 from .layout import Layout
-from .ledger import filter_by_date_range, filter_by_month, load_ledger
+from .ledger import filter_by_date_range, filter_by_month, group_by_month, load_ledger
 from .money import decimal_from_any, fmt_decimal
 from .storage import ensure_dir, read_json, write_json
 from .timeutil import utc_now_iso
-from .txutil import tx_amount_decimal, tx_category_confidence, tx_category_id, tx_currency, tx_date, tx_merchant, tx_source_type
+from .txutil import (
+    tx_amount_decimal,
+    tx_category_confidence,
+    tx_category_id,
+    tx_currency,
+    tx_date,
+    tx_merchant,
+    tx_source_type,
+    ymd_ordinal,
+)
+
+# categories path -> ((mtime_ns, size), labels); categories.json is rewritten, not appended.
+_CATEGORY_LABELS_MEMO: dict[Path, tuple[tuple[int, int], dict[str, str]]] = {}
 
 
 def _load_category_labels(layout: Layout) -> dict[str, str]:
-    cfg = read_json(layout.categories_path, {"categories": []})
+    path = layout.categories_path
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return {}
+    key = (st.st_mtime_ns, st.st_size)
+    hit = _CATEGORY_LABELS_MEMO.get(path)
+    if hit is not None and hit[0] == key:
+        # Reports embed the labels, so hand out a copy rather than the memoized dict.
+        return dict(hit[1])
+    cfg = read_json(path, {"categories": []})
     out: dict[str, str] = {}
     for c in cfg.get("categories", []):
         if not isinstance(c, dict):
@@ -26,56 +55,154 @@ def _load_category_labels(layout: Layout) -> dict[str, str]:
         label = str(c.get("label") or "").strip()
         if cid and label:
             out[cid] = label
-    return out
+    _CATEGORY_LABELS_MEMO[path] = (key, out)
+    return dict(out)
+
+
+# One row per tx, built once per report group and shared by the summarizers:
+# (currency or "UNK", amount, merchant, date, category id or "uncategorized", tx).
+# The amount is an int in units of 10**exp when the projection has an exponent, else a Decimal.
+_Row = tuple[str, "int | Decimal", str, str, str, dict[str, Any]]
+
+
+@dataclass(frozen=True)
+class _Projection:
+    rows: list[_Row]
+    exp: int | None
+
+    @property
+    def zero(self) -> int | Decimal:
+        return 0 if self.exp is not None else Decimal("0")
+
+    def dec(self, v: int | Decimal) -> Decimal:
+        return Decimal(v).scaleb(self.exp) if self.exp is not None else v  # type: ignore[return-value]
+
+    def slice(self, start: int, stop: int) -> _Projection:
+        return _Projection(rows=self.rows[start:stop], exp=self.exp)
+
+
+def _project(txs: list[dict[str, Any]]) -> _Projection:
+    rows: list[_Row] = [
+        (tx_currency(t) or "UNK", tx_amount_decimal(t), tx_merchant(t), tx_date(t), tx_category_id(t) or "uncategorized", t)
+        for t in txs
+    ]
+    # When every amount carries the same non-positive exponent (e.g. all "12.30"-style), sums
+    # can run on ints: Decimal addition would keep that exponent too, so output is identical.
+    # Mixed precision or non-finite amounts keep exact Decimal arithmetic. The exponent check
+    # and the int conversion share one pass: scaling by the first row's exponent leaves an
+    # integral exponent only for rows with that same exponent.
+    if not rows:
+        return _Projection(rows=rows, exp=None)
+    exp = rows[0][1].as_tuple().exponent  # type: ignore[union-attr]
+    if not isinstance(exp, int) or exp > 0:
+        return _Projection(rows=rows, exp=None)
+    scale = -exp
+    units: list[_Row] = []
+    append = units.append
+    for c, a, m, d, cat, t in rows:
+        n = a.scaleb(scale)  # type: ignore[union-attr]
+        if n.as_tuple().exponent != 0:
+            return _Projection(rows=rows, exp=None)
+        append((c, int(n), m, d, cat, t))
+    return _Projection(rows=units, exp=exp)
+
+
+def _sum_currency(proj: _Projection) -> dict[str, dict[str, str]]:
+    zero = proj.zero
+    spend: dict[str, Any] = defaultdict(lambda: zero)
+    income: dict[str, Any] = defaultdict(lambda: zero)
+    net: dict[str, Any] = defaultdict(lambda: zero)
+    for ccy, amt, *_ in proj.rows:
+        if amt < 0:
+            spend[ccy] -= amt
+        else:
+            income[ccy] += amt
+        net[ccy] += amt
+    # A side with no txs renders as "0" rather than a scaled zero like "0.00".
+    dec = proj.dec
+    return {
+        ccy: {
+            "spend": fmt_decimal(dec(spend[ccy])) if ccy in spend else "0",
+            "income": fmt_decimal(dec(income[ccy])) if ccy in income else "0",
+            "net": fmt_decimal(dec(total)),
+        }
+        for ccy, total in net.items()
+    }
 
 
-def _sum_currency(txs: list[dict[str, Any]]) -> dict[str, dict[str, str]]:
-    acc: dict[str, dict[str, Decimal]] = defaultdict(lambda: {"spend": Decimal("0"), "income": Decimal("0"), "net": Decimal("0")})
-    for tx in txs:
-        ccy = tx_currency(tx) or "UNK"
-        amt = tx_amount_decimal(tx)
+_Totals = dict[tuple[str, str], Any]
+
+
+def _category_totals(proj: _Projection) -> _Totals:
+    zero = proj.zero
+    cats: _Totals = defaultdict(lambda: zero)
+    for ccy, amt, _m, _d, cat, _t in proj.rows:
         if amt < 0:
-            acc[ccy]["spend"] += -amt
-        else:
-            acc[ccy]["income"] += amt
-        acc[ccy]["net"] += amt
-    return {ccy: {k: fmt_decimal(v) for k, v in vals.items()} for ccy, vals in acc.items()}
+            cats[(ccy, cat)] -= amt
+    return cats
 
 
-def _top_categories(txs: list[dict[str, Any]], *, limit: int = 8) -> list[dict[str, Any]]:
-    totals: dict[tuple[str, str], Decimal] = defaultdict(lambda: Decimal("0"))
-    for tx in txs:
-        amt = tx_amount_decimal(tx)
+def _debit_totals(proj: _Projection) -> tuple[_Totals, _Totals, dict[tuple[str, str], int]]:
+    """Debit totals per (currency, category) and per (currency, merchant), plus merchant tx counts, in one walk."""
+    zero = proj.zero
+    cats: _Totals = defaultdict(lambda: zero)
+    merchants: _Totals = defaultdict(lambda: zero)
+    counts: dict[tuple[str, str], int] = defaultdict(int)
+    for ccy, amt, m, _d, cat, _t in proj.rows:
         if amt >= 0:
             continue
-        ccy = tx_currency(tx) or "UNK"
-        cat = tx_category_id(tx) or "uncategorized"
-        totals[(ccy, cat)] += -amt
+        cats[(ccy, cat)] -= amt
+        key = (ccy, m or "UNKNOWN")
+        merchants[key] -= amt
+        counts[key] += 1
+    return cats, merchants, counts
+
+
+def _top_categories(proj: _Projection, cats: _Totals, *, limit: int = 8) -> list[dict[str, Any]]:
     out = []
-    for (ccy, cat), val in sorted(totals.items(), key=lambda kv: kv[1], reverse=True)[:limit]:
-        out.append({"currency": ccy, "categoryId": cat, "value": fmt_decimal(val)})
+    for (ccy, cat), val in heapq.nlargest(limit, cats.items(), key=itemgetter(1)):
+        out.append({"currency": ccy, "categoryId": cat, "value": fmt_decimal(proj.dec(val))})
     return out
 
 
-def _top_merchants(txs: list[dict[str, Any]], *, limit: int = 8) -> list[dict[str, Any]]:
-    totals: dict[tuple[str, str], dict[str, Any]] = {}
-    for tx in txs:
-        amt = tx_amount_decimal(tx)
-        if amt >= 0:
-            continue
-        ccy = tx_currency(tx) or "UNK"
-        m = tx_merchant(tx) or "UNKNOWN"
-        key = (ccy, m)
-        if key not in totals:
-            totals[key] = {"value": Decimal("0"), "count": 0}
-        totals[key]["value"] += -amt
-        totals[key]["count"] += 1
+def _top_merchants(
+    proj: _Projection, merchants: _Totals, counts: dict[tuple[str, str], int], *, limit: int = 8
+) -> list[dict[str, Any]]:
     out = []
-    for (ccy, m), data in sorted(totals.items(), key=lambda kv: kv[1]["value"], reverse=True)[:limit]:
-        out.append({"currency": ccy, "merchant": m, "value": fmt_decimal(data["value"]), "count": int(data["count"])})
+    for (ccy, m), val in heapq.nlargest(limit, merchants.items(), key=itemgetter(1)):
+        out.append({"currency": ccy, "merchant": m, "value": fmt_decimal(proj.dec(val)), "count": counts[(ccy, m)]})
     return out
 
 
+def _decimal_totals(proj: _Projection, totals: _Totals) -> dict[tuple[str, str], Decimal]:
+    dec = proj.dec
+    return {k: dec(v) for k, v in totals.items()}
+
+
+def _spikes(
+    cur: dict[tuple[str, str], Decimal],
+    prev: dict[tuple[str, str], Decimal],
+    *,
+    n_prev: int,
+    label: str,
+    limit: int = 25,
+) -> list[dict[str, Any]]:
+    # Rows are ranked by the unformatted delta; fmt_decimal is exact, so this matches
+    # ranking by the rendered "current" and "avgPrev3" strings. Only the top rows get formatted.
+    ranked: list[tuple[Decimal, tuple[str, str], Decimal, Decimal]] = []
+    for key, cur_val in cur.items():
+        prev_val = prev.get(key, Decimal("0"))
+        avg = (prev_val / Decimal(str(n_prev))) if n_prev else Decimal("0")
+        delta = cur_val - avg
+        # Basic heuristic thresholds.
+        if avg > 0 and cur_val > avg * Decimal("1.5") and delta > Decimal("50"):
+            ranked.append((delta, key, cur_val, avg))
+    return [
+        {"currency": key[0], label: key[1], "current": fmt_decimal(cur_val), "avgPrev3": fmt_decimal(avg)}
+        for _, key, cur_val, avg in heapq.nlargest(limit, ranked, key=itemgetter(0))
+    ]
+
+
 def _review_queue(txs: list[dict[str, Any]], *, cat_conf_threshold: float = 0.60) -> list[dict[str, Any]]:
     items: list[dict[str, Any]] = []
     for tx in txs:
@@ -106,20 +233,25 @@ def _review_queue(txs: list[dict[str, Any]], *, cat_conf_threshold: float = 0.60
     return items
 
 
-def _merchant_score(a: str, b: str) -> float:
-    def norm(s: str) -> str:
-        return re.sub(r"[^a-z0-9]+", " ", s.lower()).strip()
+_NORM_RE = re.compile(r"[^a-z0-9]+")
+
+
+@lru_cache(maxsize=4096)
+def _norm(s: str) -> tuple[str, frozenset[str]]:
+    n = _NORM_RE.sub(" ", s.lower()).strip()
+    return n, frozenset(n.split())
 
-    aa = norm(a)
-    bb = norm(b)
+
+def _merchant_score(a: tuple[str, frozenset[str]], b: tuple[str, frozenset[str]]) -> float:
+    """Similarity of two merchants already passed through _norm."""
+    aa, ta = a
+    bb, tb = b
     if not aa or not bb:
         return 0.0
     if aa == bb:
         return 1.0
     if aa in bb or bb in aa:
         return 0.8
-    ta = set(aa.split())
-    tb = set(bb.split())
     if not ta or not tb:
         return 0.0
     return len(ta & tb) / len(ta | tb)
@@ -135,9 +267,31 @@ def _possible_manual_bank_duplicates(
     """
     Return mapping manualTxId -> bankTxId for likely duplicates.
     """
-    day_dt = datetime.strptime(day, "%Y-%m-%d").date()
+    day_ord = datetime.strptime(day, "%Y-%m-%d").date().toordinal()
     manual = [t for t in all_txs if tx_source_type(t) == "manual" and tx_date(t) == day]
-    banks = [t for t in all_txs if tx_source_type(t) == "bank_csv"]
+    if not manual:
+        return {}
+
+    # Every manual tx is on `day`, so only bank debits inside the day window can match.
+    # Bucket those once by floor cents of the outflow; each manual tx then probes the few
+    # buckets its tolerance covers. Entries keep their ledger position for tie order.
+    by_cents: dict[int, list[tuple[int, Decimal, dict[str, Any], tuple[str, frozenset[str]]]]] = defaultdict(list)
+    for pos, t in enumerate(all_txs):
+        if tx_source_type(t) != "bank_csv":
+            continue
+        bd = ymd_ordinal(tx_date(t))
+        if bd is None or abs(bd - day_ord) > max_days_diff:
+            continue
+        try:
+            bam = tx_amount_decimal(t)
+        except (ValueError, TypeError):
+            continue
+        if not bam.is_finite() or bam >= 0:
+            continue
+        by_cents[int((-bam * 100).to_integral_value(rounding=ROUND_FLOOR))].append((pos, -bam, t, _norm(tx_merchant(t))))
+
+    # Sorted bucket keys let any tolerance width resolve to a contiguous slice.
+    cent_keys = sorted(by_cents)
 
     out: dict[str, str] = {}
     for mtx in manual:
@@ -149,29 +303,22 @@ def _possible_manual_bank_duplicates(
             continue
         mamt = -mam
         mccy = tx_currency(mtx)
-        mmer = tx_merchant(mtx)
+        mmer = _norm(tx_merchant(mtx))
+
+        lo_c = int(((mamt - amount_tolerance) * 100).to_integral_value(rounding=ROUND_FLOOR))
+        hi_c = int(((mamt + amount_tolerance) * 100).to_integral_value(rounding=ROUND_CEILING))
+        cands = [e for c in cent_keys[bisect_left(cent_keys, lo_c) : bisect_right(cent_keys, hi_c)] for e in by_cents[c]]
+        cands.sort(key=lambda e: e[0])
 
         best = None
         best_score = -1.0
-        for btx in banks:
-            bd_s = tx_date(btx)
-            if not bd_s:
-                continue
-            try:
-                bd = datetime.strptime(bd_s, "%Y-%m-%d").date()
-            except ValueError:
-                continue
-            if abs((bd - day_dt).days) > max_days_diff:
-                continue
+        for _, bamt, btx, bmer in cands:
             if mccy and tx_currency(btx) and tx_currency(btx) != mccy:
                 continue
-            bam = tx_amount_decimal(btx)
-            if bam >= 0:
-                continue
-            if abs((-bam) - mamt) > amount_tolerance:
+            if abs(bamt - mamt) > amount_tolerance:
                 continue
 
-            score = 0.5 + 0.5 * _merchant_score(mmer, tx_merchant(btx))
+            score = 0.5 + 0.5 * _merchant_score(mmer, bmer)
             if score > best_score:
                 best_score = score
                 best = btx
@@ -192,25 +339,22 @@ def _month_bounds(month: str) -> tuple[str, str]:
 
 
 def _detect_recurring(
-    txs: list[dict[str, Any]],
+    proj: _Projection,
     *,
     min_occurrences: int = 3,
     spacing_days: tuple[int, int] = (25, 35),
 ) -> list[dict[str, Any]]:
-    # Group by (merchant, currency) for debits, keep amounts to detect drift.
-    groups: dict[tuple[str, str], list[tuple[str, Decimal]]] = defaultdict(list)
-    for tx in txs:
-        amt = tx_amount_decimal(tx)
-        if amt >= 0:
-            continue
-        merchant = tx_merchant(tx)
-        if not merchant:
+    # Group by (merchant, currency) for debits, keep amounts (in projection units) to detect drift.
+    groups: dict[tuple[str, str], list[tuple[str, Any]]] = defaultdict(list)
+    lowered: dict[str, str] = {}
+    for ccy, amt, merchant, d, _cat, _t in proj.rows:
+        if amt >= 0 or not merchant or not d:
             continue
-        ccy = tx_currency(tx) or "UNK"
-        d = tx_date(tx)
-        if not d:
-            continue
-        groups[(merchant.lower(), ccy)].append((d, -amt))
+        key = lowered.get(merchant)
+        if key is None:
+            key = lowered[merchant] = merchant.lower()
+        groups[(key, ccy)].append((d, -amt))
+    dec = proj.dec
 
     out: list[dict[str, Any]] = []
     for (m, ccy), items in groups.items():
@@ -220,27 +364,28 @@ def _detect_recurring(
 
         dates = [d for d, _ in items2]
         amounts = [a for _, a in items2]
-
-        # Find the most recent window that satisfies spacing.
-        best_window = None
-        for end in range(min_occurrences, len(dates) + 1):
-            window_dates = dates[end - min_occurrences : end]
-            ok = True
-            for a, b in zip(window_dates, window_dates[1:]):
-                da = datetime.strptime(a, "%Y-%m-%d").date()
-                db = datetime.strptime(b, "%Y-%m-%d").date()
-                delta = (db - da).days
-                if delta < spacing_days[0] or delta > spacing_days[1]:
-                    ok = False
-                    break
-            if ok:
-                best_window = (end - min_occurrences, end)
+        ords = [ymd_ordinal(d) for d in dates]
+
+        # Find the most recent window that satisfies spacing: the last index where the run of
+        # in-range consecutive gaps reaches min_occurrences - 1. A missing date breaks the run.
+        lo, hi = spacing_days
+        need = min_occurrences - 1
+        best_window = (len(ords) - min_occurrences, len(ords)) if need <= 0 else None
+        run = 0
+        for i in range(1, len(ords) if need > 0 else 0):
+            a, b = ords[i - 1], ords[i]
+            if a is not None and b is not None and lo <= b - a <= hi:
+                run += 1
+                if run >= need:
+                    best_window = (i + 1 - min_occurrences, i + 1)
+            else:
+                run = 0
         if best_window is None:
             continue
 
         i0, i1 = best_window
         recent_dates = dates[i0:i1]
-        recent_amounts = amounts[i0:i1]
+        recent_amounts = [dec(a) for a in amounts[i0:i1]]
         last_amount = recent_amounts[-1]
         prev_amount = recent_amounts[-2] if len(recent_amounts) >= 2 else None
 
@@ -278,18 +423,21 @@ def daily_report_data(layout: Layout, *, date: str) -> dict[str, Any]:
     rolling_txs = filter_by_date_range(view.transactions, from_date=from_7, to_date=to_7)
 
     categories = _load_category_labels(layout)
+    day_rows = _project(day_txs)
+    rolling_rows = _project(rolling_txs)
+    day_cats, day_merch, day_counts = _debit_totals(day_rows)
 
     data = {
         "date": date,
         "generatedAt": utc_now_iso(),
-        "summary": _sum_currency(day_txs),
-        "topCategoriesToday": _top_categories(day_txs),
-        "topMerchantsToday": _top_merchants(day_txs),
+        "summary": _sum_currency(day_rows),
+        "topCategoriesToday": _top_categories(day_rows, day_cats),
+        "topMerchantsToday": _top_merchants(day_rows, day_merch, day_counts),
         "rolling7d": {
             "from": from_7,
             "to": to_7,
-            "summary": _sum_currency(rolling_txs),
-            "topCategories": _top_categories(rolling_txs),
+            "summary": _sum_currency(rolling_rows),
+            "topCategories": _top_categories(rolling_rows, _category_totals(rolling_rows)),
         },
         "reviewQueue": _review_queue(day_txs),
         "possibleDuplicates": _possible_manual_bank_duplicates(view.transactions, day=date),
@@ -299,86 +447,56 @@ def daily_report_data(layout: Layout, *, date: str) -> dict[str, Any]:
     return data
 
 
-def render_daily_report_md(data: dict[str, Any]) -> str:
-    date = data["date"]
-    cat_labels = data.get("categoryLabels") or {}
+def _summary_lines(summary: dict[str, dict[str, str]]) -> list[str]:
+    return [f"- {ccy}: spend {v['spend']}, income {v['income']}, net {v['net']}" for ccy, v in sorted(summary.items())]
 
-    lines: list[str] = []
-    lines.append(f"# Daily Report: {date}")
-    lines.append("")
 
-    lines.append("## Summary")
-    for ccy, vals in sorted((data.get("summary") or {}).items()):
-        lines.append(f"- {ccy}: spend {vals['spend']}, income {vals['income']}, net {vals['net']}")
-    lines.append("")
+def _review_line(item: dict[str, Any]) -> str:
+    amt = item.get("amount") or {}
+    val, ccy = (amt.get("value"), amt.get("currency")) if isinstance(amt, dict) else ("", "")
+    reasons = ", ".join(item.get("reasons") or [])
+    return f"- {item.get('txId') or ''}: {item.get('merchant') or ''} {val} {ccy} ({reasons})"
 
-    lines.append("## Top Categories (Today)")
-    top_cats = data.get("topCategoriesToday") or []
-    if not top_cats:
-        lines.append("- (none)")
-    else:
-        for item in top_cats:
-            cid = item["categoryId"]
-            label = cat_labels.get(cid, cid)
-            lines.append(f"- {label} ({item['currency']}): {item['value']}")
-    lines.append("")
 
-    lines.append("## Top Merchants (Today)")
+def render_daily_report_md(data: dict[str, Any]) -> str:
+    date = data["date"]
+    label = (data.get("categoryLabels") or {}).get
+    none = ["- (none)"]
+
+    lines: list[str] = [f"# Daily Report: {date}", "", "## Summary"]
+    lines.extend(_summary_lines(data.get("summary") or {}))
+    lines.extend(("", "## Top Categories (Today)"))
+    top_cats = data.get("topCategoriesToday") or []
+    lines.extend(
+        [f"- {label(i['categoryId'], i['categoryId'])} ({i['currency']}): {i['value']}" for i in top_cats] or none
+    )
+    lines.extend(("", "## Top Merchants (Today)"))
     top_merch = data.get("topMerchantsToday") or []
-    if not top_merch:
-        lines.append("- (none)")
-    else:
-        for item in top_merch:
-            lines.append(f"- {item['merchant']} ({item['currency']}): {item['value']} ({item['count']} tx)")
+    lines.extend(
+        [f"- {i['merchant']} ({i['currency']}): {i['value']} ({i['count']} tx)" for i in top_merch] or none
+    )
     lines.append("")
 
     roll = data.get("rolling7d") or {}
     lines.append(f"## Rolling 7 Days ({roll.get('from')} to {roll.get('to')})")
-    for ccy, vals in sorted((roll.get("summary") or {}).items()):
-        lines.append(f"- {ccy}: spend {vals['spend']}, income {vals['income']}, net {vals['net']}")
-    lines.append("")
-    lines.append("### Top Categories (Rolling 7 Days)")
+    lines.extend(_summary_lines(roll.get("summary") or {}))
+    lines.extend(("", "### Top Categories (Rolling 7 Days)"))
     roll_cats = roll.get("topCategories") or []
-    if not roll_cats:
-        lines.append("- (none)")
-    else:
-        for item in roll_cats:
-            cid = item["categoryId"]
-            label = cat_labels.get(cid, cid)
-            lines.append(f"- {label} ({item['currency']}): {item['value']}")
-    lines.append("")
+    lines.extend(
+        [f"- {label(i['categoryId'], i['categoryId'])} ({i['currency']}): {i['value']}" for i in roll_cats] or none
+    )
 
-    lines.append("## Review Queue")
+    lines.extend(("", "## Review Queue"))
     rq = data.get("reviewQueue") or []
-    if not rq:
-        lines.append("- (none)")
-    else:
-        for item in rq[:50]:
-            tx_id = item.get("txId") or ""
-            merchant = item.get("merchant") or ""
-            reasons = ", ".join(item.get("reasons") or [])
-            amt = item.get("amount") or {}
-            val = amt.get("value") if isinstance(amt, dict) else ""
-            ccy = amt.get("currency") if isinstance(amt, dict) else ""
-            lines.append(f"- {tx_id}: {merchant} {val} {ccy} ({reasons})")
-    lines.append("")
+    lines.extend([_review_line(i) for i in rq[:50]] or none)
 
-    lines.append("## Possible Duplicates (Manual vs Bank)")
+    lines.extend(("", "## Possible Duplicates (Manual vs Bank)"))
     dup = data.get("possibleDuplicates") or {}
-    if not dup:
-        lines.append("- (none)")
-    else:
-        for mid, bid in list(dup.items())[:50]:
-            lines.append(f"- manual {mid} may duplicate bank {bid}")
-    lines.append("")
+    lines.extend([f"- manual {mid} may duplicate bank {bid}" for mid, bid in islice(dup.items(), 50)] or none)
 
-    lines.append("## Alerts (Today)")
+    lines.extend(("", "## Alerts (Today)"))
     al = data.get("alerts") or []
-    if not al:
-        lines.append("- (none)")
-    else:
-        for evt in al[-50:]:
-            lines.append(f"- [{evt.get('ruleId')}] {evt.get('message')}")
+    lines.extend([f"- [{evt.get('ruleId')}] {evt.get('message')}" for evt in al[-50:]] or none)
     lines.append("")
 
     return "\n".join(lines)
@@ -398,7 +516,6 @@ def write_daily_report(layout: Layout, *, date: str) -> dict[str, str]:
 
 def monthly_report_data(layout: Layout, *, month: str) -> dict[str, Any]:
     view = load_ledger(layout, include_deleted=False)
-    month_txs = filter_by_month(view.transactions, month)
 
     start, end = _month_bounds(month)
 
@@ -415,22 +532,31 @@ def monthly_report_data(layout: Layout, *, month: str) -> dict[str, Any]:
             yy -= 1
             mm = 12
     months = list(reversed(months))
-    trailing_txs: list[dict[str, Any]] = []
-    for mo in months:
-        trailing_txs.extend(filter_by_month(view.transactions, mo))
+    # One walk over the ledger serves the current, trailing and previous months, and one
+    # projection of the trailing window is sliced per month group below.
+    by_month = group_by_month(view.transactions)
+    buckets = [by_month.get(mo, []) for mo in months]
+    starts = list(accumulate(map(len, buckets), initial=0))
+    trailing = _project(list(chain.from_iterable(buckets)))
 
-    recurring = _detect_recurring(trailing_txs)
+    recurring = _detect_recurring(trailing)
+
+    if month == months[-1]:
+        month_rows = trailing.slice(starts[-2], starts[-1])
+    else:
+        # Non-canonical spelling (e.g. "2026-1"): keep filter_by_month's exact match.
+        month_rows = _project(filter_by_month(view.transactions, month))
 
     # Manual vs imported ratio.
-    by_source: dict[str, dict[str, Any]] = defaultdict(lambda: {"count": 0, "spend": Decimal("0"), "income": Decimal("0")})
-    for tx in month_txs:
-        st = tx_source_type(tx) or "unknown"
-        by_source[st]["count"] += 1
-        amt = tx_amount_decimal(tx)
+    zero = month_rows.zero
+    by_source: dict[str, dict[str, Any]] = defaultdict(lambda: {"count": 0})
+    for _c, amt, _m, _d, _cat, tx in month_rows.rows:
+        data = by_source[tx_source_type(tx) or "unknown"]
+        data["count"] += 1
         if amt < 0:
-            by_source[st]["spend"] += -amt
+            data["spend"] = data.get("spend", zero) - amt
         else:
-            by_source[st]["income"] += amt
+            data["income"] = data.get("income", zero) + amt
 
     source_summary = []
     for st, data in sorted(by_source.items(), key=lambda kv: kv[1]["count"], reverse=True):
@@ -438,136 +564,93 @@ def monthly_report_data(layout: Layout, *, month: str) -> dict[str, Any]:
             {
                 "sourceType": st,
                 "count": int(data["count"]),
-                "spend": fmt_decimal(data["spend"]),
-                "income": fmt_decimal(data["income"]),
+                "spend": fmt_decimal(month_rows.dec(data["spend"])) if "spend" in data else "0",
+                "income": fmt_decimal(month_rows.dec(data["income"])) if "income" in data else "0",
             }
         )
 
     # Anomalies/spikes: compare to previous 3 months average.
     prev_months = months[:-1][-3:]
-    prev_tx = []
-    for mo in prev_months:
-        prev_tx.extend(filter_by_month(view.transactions, mo))
-
-    def cat_totals(txs: list[dict[str, Any]]) -> dict[tuple[str, str], Decimal]:
-        t: dict[tuple[str, str], Decimal] = defaultdict(lambda: Decimal("0"))
-        for tx in txs:
-            amt = tx_amount_decimal(tx)
-            if amt >= 0:
-                continue
-            t[(tx_currency(tx) or "UNK", tx_category_id(tx) or "uncategorized")] += -amt
-        return t
-
-    cur_cats = cat_totals(month_txs)
-    prev_cats = cat_totals(prev_tx)
-    spikes = []
-    for key, cur_val in cur_cats.items():
-        prev_val = prev_cats.get(key, Decimal("0"))
-        avg = (prev_val / Decimal(str(len(prev_months)))) if prev_months else Decimal("0")
-        # Basic heuristic thresholds.
-        if avg > 0 and cur_val > avg * Decimal("1.5") and (cur_val - avg) > Decimal("50"):
-            spikes.append({"currency": key[0], "categoryId": key[1], "current": fmt_decimal(cur_val), "avgPrev3": fmt_decimal(avg)})
-    spikes.sort(key=lambda r: Decimal(r["current"]) - Decimal(r["avgPrev3"]), reverse=True)
-
-    # Merchant spikes.
-    def merchant_totals(txs: list[dict[str, Any]]) -> dict[tuple[str, str], Decimal]:
-        t: dict[tuple[str, str], Decimal] = defaultdict(lambda: Decimal("0"))
-        for tx in txs:
-            amt = tx_amount_decimal(tx)
-            if amt >= 0:
-                continue
-            t[(tx_currency(tx) or "UNK", tx_merchant(tx) or "UNKNOWN")] += -amt
-        return t
-
-    cur_merch = merchant_totals(month_txs)
-    prev_merch = merchant_totals(prev_tx)
-    merch_spikes = []
-    for key, cur_val in cur_merch.items():
-        prev_val = prev_merch.get(key, Decimal("0"))
-        avg = (prev_val / Decimal(str(len(prev_months)))) if prev_months else Decimal("0")
-        if avg > 0 and cur_val > avg * Decimal("1.5") and (cur_val - avg) > Decimal("50"):
-            merch_spikes.append({"currency": key[0], "merchant": key[1], "current": fmt_decimal(cur_val), "avgPrev3": fmt_decimal(avg)})
-    merch_spikes.sort(key=lambda r: Decimal(r["current"]) - Decimal(r["avgPrev3"]), reverse=True)
+    prev_rows = trailing.slice(starts[len(months) - 1 - len(prev_months)], starts[-2])
+
+    cur_cats, cur_merch, cur_counts = _debit_totals(month_rows)
+    prev_cats, prev_merch, _ = _debit_totals(prev_rows)
+    spikes = _spikes(
+        _decimal_totals(month_rows, cur_cats), _decimal_totals(prev_rows, prev_cats), n_prev=len(prev_months), label="categoryId"
+    )
+    merch_spikes = _spikes(
+        _decimal_totals(month_rows, cur_merch), _decimal_totals(prev_rows, prev_merch), n_prev=len(prev_months), label="merchant"
+    )
 
     data = {
         "month": month,
         "from": start,
         "to": end,
         "generatedAt": utc_now_iso(),
-        "summary": _sum_currency(month_txs),
-        "categoryBreakdown": _top_categories(month_txs, limit=50),
-        "merchantTop": _top_merchants(month_txs, limit=50),
+        "summary": _sum_currency(month_rows),
+        "categoryBreakdown": _top_categories(month_rows, cur_cats, limit=50),
+        "merchantTop": _top_merchants(month_rows, cur_merch, cur_counts, limit=50),
         "recurring": recurring,
-        "categorySpikes": spikes[:25],
-        "merchantSpikes": merch_spikes[:25],
+        "categorySpikes": spikes,
+        "merchantSpikes": merch_spikes,
         "sourceSummary": source_summary,
         "categoryLabels": _load_category_labels(layout),
     }
     return data
 
 
-def render_monthly_report_md(data: dict[str, Any]) -> str:
-    month = data["month"]
-    cat_labels = data.get("categoryLabels") or {}
-
-    lines: list[str] = []
-    lines.append(f"# Monthly Report: {month}")
-    lines.append("")
+def _recurring_line(r: dict[str, Any]) -> str:
+    drift = ""
+    if r.get("drift") and r.get("prevAmount") and r.get("driftPct"):
+        drift = f" (drift: {r['prevAmount']} -> {r['lastAmount']} = {r['drift']} / {r['driftPct']}%)"
+    return (
+        f"- {r['merchant']} ({r['currency']}): recent {', '.join(r['recentAmounts'])} on {', '.join(r['recentDates'])}"
+        f" (occurrences: {r['occurrences']}){drift}"
+    )
 
-    lines.append("## Summary")
-    for ccy, vals in sorted((data.get("summary") or {}).items()):
-        lines.append(f"- {ccy}: spend {vals['spend']}, income {vals['income']}, net {vals['net']}")
-    lines.append("")
 
-    lines.append("## Category Breakdown")
-    for item in (data.get("categoryBreakdown") or [])[:20]:
-        cid = item["categoryId"]
-        label = cat_labels.get(cid, cid)
-        lines.append(f"- {label} ({item['currency']}): {item['value']}")
-    lines.append("")
-
-    lines.append("## Top Merchants")
-    for item in (data.get("merchantTop") or [])[:20]:
-        lines.append(f"- {item['merchant']} ({item['currency']}): {item['value']} ({item['count']} tx)")
-    lines.append("")
-
-    lines.append("## Recurring Charges (Detected)")
+def render_monthly_report_md(data: dict[str, Any]) -> str:
+    month = data["month"]
+    label = (data.get("categoryLabels") or {}).get
+    none = ["- (none)"]
+
+    lines: list[str] = [f"# Monthly Report: {month}", "", "## Summary"]
+    lines.extend(_summary_lines(data.get("summary") or {}))
+    lines.extend(("", "## Category Breakdown"))
+    lines.extend(
+        f"- {label(i['categoryId'], i['categoryId'])} ({i['currency']}): {i['value']}"
+        for i in (data.get("categoryBreakdown") or [])[:20]
+    )
+    lines.extend(("", "## Top Merchants"))
+    lines.extend(
+        f"- {i['merchant']} ({i['currency']}): {i['value']} ({i['count']} tx)" for i in (data.get("merchantTop") or [])[:20]
+    )
+
+    lines.extend(("", "## Recurring Charges (Detected)"))
     rec = data.get("recurring") or []
-    if not rec:
-        lines.append("- (none)")
-    else:
-        for r in rec[:25]:
-            drift = ""
-            if r.get("drift") and r.get("prevAmount") and r.get("driftPct"):
-                drift = f" (drift: {r['prevAmount']} -> {r['lastAmount']} = {r['drift']} / {r['driftPct']}%)"
-            lines.append(
-                f"- {r['merchant']} ({r['currency']}): recent {', '.join(r['recentAmounts'])} on {', '.join(r['recentDates'])} (occurrences: {r['occurrences']}){drift}"
-            )
-    lines.append("")
+    lines.extend([_recurring_line(r) for r in rec[:25]] or none)
 
-    lines.append("## Category Spikes (Vs Avg Prev 3 Months)")
+    lines.extend(("", "## Category Spikes (Vs Avg Prev 3 Months)"))
     spikes = data.get("categorySpikes") or []
-    if not spikes:
-        lines.append("- (none)")
-    else:
-        for s in spikes[:25]:
-            cid = s["categoryId"]
-            label = cat_labels.get(cid, cid)
-            lines.append(f"- {label} ({s['currency']}): current {s['current']} vs avg {s['avgPrev3']}")
-    lines.append("")
-
-    lines.append("## Merchant Spikes (Vs Avg Prev 3 Months)")
+    lines.extend(
+        [
+            f"- {label(s['categoryId'], s['categoryId'])} ({s['currency']}): current {s['current']} vs avg {s['avgPrev3']}"
+            for s in spikes[:25]
+        ]
+        or none
+    )
+
+    lines.extend(("", "## Merchant Spikes (Vs Avg Prev 3 Months)"))
     msp = data.get("merchantSpikes") or []
-    if not msp:
-        lines.append("- (none)")
-    else:
-        for s in msp[:25]:
-            lines.append(f"- {s['merchant']} ({s['currency']}): current {s['current']} vs avg {s['avgPrev3']}")
-    lines.append("")
-
-    lines.append("## Manual vs Imported")
-    for s in data.get("sourceSummary") or []:
-        lines.append(f"- {s['sourceType']}: {s['count']} tx (spend {s['spend']}, income {s['income']})")
+    lines.extend(
+        [f"- {s['merchant']} ({s['currency']}): current {s['current']} vs avg {s['avgPrev3']}" for s in msp[:25]] or none
+    )
+
+    lines.extend(("", "## Manual vs Imported"))
+    lines.extend(
+        f"- {s['sourceType']}: {s['count']} tx (spend {s['spend']}, income {s['income']})"
+        for s in data.get("sourceSummary") or []
+    )
     lines.append("")
 
     return "\n".join(lines)
@@ -1,117 +1,261 @@
 from __future__ import annotations
 
+import marshal
+import math
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from pathlib import Path
 from typing import Any
 
 from .layout import Layout
-from .ledger import load_ledger
+from .ledger import iter_ledger
 from .manual import correction_event
-from .storage import append_jsonl, read_json
+from .sources import index_docs
+from .storage import append_jsonl, append_jsonl_many, read_json
 from .timeutil import parse_ymd, utc_now_iso
-from .txutil import tx_category_confidence, tx_category_id, tx_date, tx_merchant, tx_source_type
+from .txutil import tx_date, tx_source_type
+
+_UNCATEGORIZED = frozenset({"", "uncategorized"})
+_DUPLICATE_TAG = "duplicate_candidate"
 
 
 def _float_or_zero(value: Any) -> float:
+    # float(None) raises TypeError; JSON ints too large for a float raise OverflowError.
     try:
-        return float(value) if value is not None else 0.0
-    except Exception:
+        return float(value)
+    except (TypeError, ValueError, OverflowError):
         return 0.0
 
 
-def _tx_review_item(tx: dict[str, Any], *, cat_conf_threshold: float) -> dict[str, Any] | None:
-    reasons: list[str] = []
-    cat_id = tx_category_id(tx) or "uncategorized"
-    cat_conf = tx_category_confidence(tx)
-    merchant = str(tx.get("merchant") or "").strip()
-    desc = str(tx.get("description") or "").strip()
-    tags = tx.get("tags") if isinstance(tx.get("tags"), list) else []
+def _nonempty_str(v: Any) -> bool:
+    """Truth value of `str(v or "").strip()` without building the stripped copy."""
+    if isinstance(v, str):
+        return bool(v) and not v.isspace()
+    # Non-str JSON values that are truthy (numbers, lists, objects) never str() to blanks.
+    return bool(v)
+
+
+# Reason strings for the exact hundredths 0.00..1.00, which is what confidences usually are.
+# Keys are floats, so a lookup matches exactly when f"{conf:.2f}" would print the same text.
+_LOW_CAT_REASONS = {i / 100: f"low_category_confidence:{i / 100:.2f}" for i in range(101)}
+_LOW_PARSE_REASONS = {i / 100: f"low_parse_confidence:{i / 100:.2f}" for i in range(101)}
+
+
+# round(x, 2) returns x unchanged for these, and confidences are usually one of them.
+_HUNDREDTHS = frozenset(i / 100 for i in range(101))
+
+
+def _round2(x: float) -> float:
+    return x if x in _HUNDREDTHS else round(x, 2)
+
+
+def _low_conf_reason(table: dict[float, str], prefix: str, conf: float) -> str:
+    reason = table.get(conf)
+    # -0.0 == 0.0 finds the "0.00" entry, but formats as "-0.00".
+    if reason is None or (not conf and math.copysign(1.0, conf) < 0):
+        return f"{prefix}:{conf:.2f}"
+    return reason
+
+
+def _tx_needs_review(tx: dict[str, Any], *, cat_conf_threshold: float) -> bool:
+    """Whether `_tx_review_item` would return an item, short-circuiting without building it."""
+    # tx_category_id/tx_category_confidence inlined: one `category` lookup serves both checks.
+    cat = tx.get("category") or {}
+    if not isinstance(cat, dict) or str(cat.get("id") or "") in _UNCATEGORIZED:
+        return True
+    if _float_or_zero(cat.get("confidence")) < cat_conf_threshold:
+        return True
+    if not (_nonempty_str(tx.get("merchant")) or _nonempty_str(tx.get("description"))):
+        return True
+    tags = tx.get("tags")
+    return type(tags) is list and bool(tags) and _DUPLICATE_TAG in tags
 
-    if cat_id in ("", "uncategorized"):
+
+def _tx_review_item(tx: dict[str, Any], *, cat_conf_threshold: float, date: str | None = None) -> dict[str, Any] | None:
+    # Each field is read once and reused for both the checks and the item. `date` is the
+    # day the caller already filtered on, so tx_date(tx) is known to equal it.
+    cat = tx.get("category") or {}
+    if isinstance(cat, dict):
+        cat_id = str(cat.get("id") or "") or "uncategorized"
+        cat_conf = _float_or_zero(cat.get("confidence"))
+    else:
+        cat_id, cat_conf = "uncategorized", 0.0
+    # Same as tx_merchant(tx): empty exactly when both merchant and description are blank.
+    merchant = str(tx.get("merchant") or "").strip() or str(tx.get("description") or "").strip()
+    tags = tx.get("tags")
+
+    reasons: list[str] = []
+    if cat_id in _UNCATEGORIZED:
         reasons.append("uncategorized")
     if cat_conf < cat_conf_threshold:
-        reasons.append(f"low_category_confidence:{cat_conf:.2f}")
-    if not merchant and not desc:
+        reasons.append(_low_conf_reason(_LOW_CAT_REASONS, "low_category_confidence", cat_conf))
+    if not merchant:
         reasons.append("missing_merchant_and_description")
-    if "duplicate_candidate" in tags:
-        reasons.append("duplicate_candidate")
-
+    if type(tags) is list and tags and _DUPLICATE_TAG in tags:
+        reasons.append(_DUPLICATE_TAG)
     if not reasons:
         return None
 
     return {
         "kind": "transaction",
         "txId": tx.get("txId"),
-        "date": tx_date(tx),
-        "merchant": tx_merchant(tx),
+        "date": date or tx_date(tx),
+        "merchant": merchant,
         "categoryId": cat_id,
-        "categoryConfidence": round(cat_conf, 2),
+        "categoryConfidence": _round2(cat_conf),
         "sourceType": tx_source_type(tx),
         "amount": tx.get("amount"),
         "reasons": reasons,
     }
 
 
+# Review-relevant subset of a parse.json: (date, confidence, missing-field reasons, parser
+# template). The missing-field reasons depend only on the parse, so they are worked out once
+# per parse.json change; only the confidence check depends on the caller's threshold.
+_ParseSubset = tuple[str, float, tuple[str, ...], Any]
+
+# Parse-subset cache: docId -> ((mtime_ns, size, ino) of parse.json, subset or None for an
+# empty/non-object parse), stored as marshal next to the ledger cache. Any mismatch or
+# unreadable file just means the doc is re-read.
+_REVIEW_CACHE_VERSION = 2
+
+
+# parse.json reads are independent small-file I/O; below this many misses a pool isn't worth it.
+_PARSE_READ_PARALLEL_MIN = 8
+_PARSE_READ_MAX_WORKERS = 16
+
+
+def _parse_subset(parsed: Any) -> _ParseSubset | None:
+    if not isinstance(parsed, dict) or not parsed:
+        return None
+    ptype = str(parsed.get("type") or "")
+    missing: tuple[str, ...] = ()
+    if ptype == "receipt":
+        missing = tuple(r for k, r in (("merchant", "missing_merchant"), ("total", "missing_total")) if not parsed.get(k))
+    elif ptype == "bill":
+        missing = tuple(r for k, r in (("vendor", "missing_vendor"), ("amount", "missing_amount")) if not parsed.get(k))
+    parser = parsed.get("parser")
+    return (
+        str(parsed.get("date") or "").strip(),
+        _float_or_zero(parsed.get("confidence")),
+        missing,
+        parser.get("template") if isinstance(parser, dict) else None,
+    )
+
+
+def _read_review_cache(path: Path) -> dict[str, Any]:
+    try:
+        data = marshal.loads(path.read_bytes())
+    except (OSError, EOFError, ValueError, TypeError, MemoryError):
+        return {}
+    if not isinstance(data, tuple) or len(data) != 2 or data[0] != _REVIEW_CACHE_VERSION or not isinstance(data[1], dict):
+        return {}
+    return data[1]
+
+
+def _write_review_cache(path: Path, entries: dict[str, Any]) -> None:
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp.write_bytes(marshal.dumps((_REVIEW_CACHE_VERSION, entries)))
+        os.replace(tmp, path)
+    except (OSError, ValueError):
+        # Best-effort: parse.json files remain the source of truth.
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+
+
 def _source_parse_review_items(
     layout: Layout,
     *,
     date: str | None,
     parse_conf_threshold: float,
-) -> list[dict[str, Any]]:
-    idx = read_json(layout.sources_index_path, {"version": 1, "docs": []})
-    docs = idx.get("docs")
-    if not isinstance(docs, list):
-        return []
+    limit: int,
+) -> tuple[list[dict[str, Any]], int]:
+    """Up to `limit` source review items, plus the number of docs that need review."""
+    docs = index_docs(layout.sources_index_path)
 
-    items: list[dict[str, Any]] = []
+    cached = _read_review_cache(layout.review_cache_path)
+    # Warm reviews cost one stat per doc; plain string paths keep that to the syscall.
+    sources_dir = os.fspath(layout.sources_dir)
+    seen: dict[str, Any] = {}
+    ordered: list[tuple[dict[str, Any], str]] = []
+    misses: dict[str, tuple[int, int, int]] = {}
+    # Newest first. reversed() is a copy-free view of the shared index tuple, and output
+    # order comes from `ordered`, so the pooled reads below never need positional indices.
     for doc in reversed(docs):
         if not isinstance(doc, dict):
             continue
         doc_id = str(doc.get("docId") or "").strip()
         if not doc_id:
             continue
+        if doc_id not in seen and doc_id not in misses:
+            try:
+                st = os.stat(f"{sources_dir}/{doc_id}/parse.json")
+            except FileNotFoundError:
+                continue
+            key = (st.st_mtime_ns, st.st_size, st.st_ino)
+            entry = cached.get(doc_id)
+            if entry is not None and entry[0] == key:
+                seen[doc_id] = entry
+            else:
+                misses[doc_id] = key
+        ordered.append((doc, doc_id))
 
-        parse_path = layout.sources_dir / doc_id / "parse.json"
-        if not parse_path.exists():
-            continue
-        parsed = read_json(parse_path, {})
-        if not isinstance(parsed, dict) or not parsed:
+    # Only changed or new parse.json files are read; enough of them go through a pool.
+    def _read_subset(doc_id: str) -> _ParseSubset | None:
+        return _parse_subset(read_json(f"{sources_dir}/{doc_id}/parse.json", {}))
+
+    if len(misses) < _PARSE_READ_PARALLEL_MIN:
+        subsets = [_read_subset(doc_id) for doc_id in misses]
+    else:
+        with ThreadPoolExecutor(max_workers=min(_PARSE_READ_MAX_WORKERS, len(misses))) as ex:
+            subsets = list(ex.map(_read_subset, misses))
+    for (doc_id, key), subset in zip(misses.items(), subsets):
+        seen[doc_id] = (key, subset)
+
+    items: list[dict[str, Any]] = []
+    total = 0
+    for doc, doc_id in ordered:
+        subset = seen[doc_id][1]
+        if subset is None:
             continue
 
-        parsed_date = str(parsed.get("date") or "").strip()
+        parsed_date, conf, missing, template = subset
         if date and parsed_date and parsed_date != date:
             continue
 
-        ptype = str(parsed.get("type") or "")
-        conf = _float_or_zero(parsed.get("confidence"))
-        reasons: list[str] = []
-        if conf < parse_conf_threshold:
-            reasons.append(f"low_parse_confidence:{conf:.2f}")
-
-        if ptype == "receipt":
-            if not parsed.get("merchant"):
-                reasons.append("missing_merchant")
-            if not parsed.get("total"):
-                reasons.append("missing_total")
-        if ptype == "bill":
-            if not parsed.get("vendor"):
-                reasons.append("missing_vendor")
-            if not parsed.get("amount"):
-                reasons.append("missing_amount")
-
-        if not reasons:
+        low_conf = conf < parse_conf_threshold
+        if not (low_conf or missing):
+            continue
+        total += 1
+        if len(items) >= limit:
             continue
 
+        reasons = list(missing)
+        if low_conf:
+            reasons.insert(0, _low_conf_reason(_LOW_PARSE_REASONS, "low_parse_confidence", conf))
+
         items.append(
             {
                 "kind": "source_parse",
                 "docId": doc_id,
                 "sourceType": str(doc.get("sourceType") or ""),
                 "date": parsed_date or None,
-                "confidence": round(conf, 2),
-                "template": ((parsed.get("parser") or {}).get("template") if isinstance(parsed.get("parser"), dict) else None),
+                "confidence": _round2(conf),
+                "template": template,
                 "reasons": reasons,
             }
         )
-    return items
+
+    # Rewrite only when something changed; docs no longer in the index drop out.
+    if seen != cached:
+        _write_review_cache(layout.review_cache_path, seen)
+    return items, total
 
 
 def review_queue(
@@ -124,33 +268,34 @@ def review_queue(
 ) -> dict[str, Any]:
     if date:
         parse_ymd(date)
+    limit = max(0, int(limit))
 
-    view = load_ledger(layout, include_deleted=False)
-    txs = [tx for tx in view.transactions if (tx_date(tx) == date if date else True)]
-
-    tx_items: list[dict[str, Any]] = []
-    for tx in txs:
-        it = _tx_review_item(tx, cat_conf_threshold=cat_conf_threshold)
-        if it is not None:
-            tx_items.append(it)
+    # A cheap predicate pass flags txs as they stream out of the ledger; full items (reasons,
+    # formatting) are only built for the first `limit`. The rest are just counted so `counts`
+    # reports the full queue size.
+    flagged = (tx for tx in iter_ledger(layout, date=date) if _tx_needs_review(tx, cat_conf_threshold=cat_conf_threshold))
+    items = [_tx_review_item(tx, cat_conf_threshold=cat_conf_threshold, date=date) for tx in islice(flagged, limit)]
+    tx_total = len(items) + sum(1 for _ in flagged)
 
-    source_items = _source_parse_review_items(layout, date=date, parse_conf_threshold=parse_conf_threshold)
-    items = tx_items + source_items
-    items = items[: max(0, int(limit))]
+    # Source items fill whatever room the txs left, so the combined list never exceeds `limit`.
+    source_items, source_total = _source_parse_review_items(
+        layout, date=date, parse_conf_threshold=parse_conf_threshold, limit=limit - len(items)
+    )
+    items.extend(source_items)
 
     return {
         "generatedAt": utc_now_iso(),
         "date": date,
         "counts": {
-            "transactions": len(tx_items),
-            "sourceParses": len(source_items),
-            "total": len(tx_items) + len(source_items),
+            "transactions": tx_total,
+            "sourceParses": source_total,
+            "total": tx_total + source_total,
         },
         "items": items,
     }
 
 
-def resolve_review_transaction(layout: Layout, *, tx_id: str, patch: dict[str, Any], reason: str = "review_resolve") -> dict[str, Any]:
+def _resolve_event(tx_id: Any, patch: Any, reason: str) -> dict[str, Any]:
     tx_id = str(tx_id or "").strip()
     if not tx_id:
         raise ValueError("tx_id is required")
@@ -158,6 +303,24 @@ def resolve_review_transaction(layout: Layout, *, tx_id: str, patch: dict[str, A
         raise ValueError("patch is required")
     if "occurredAt" in patch:
         parse_ymd(str(patch["occurredAt"]))
-    evt = correction_event(tx_id, patch=patch, reason=reason)
+    return correction_event(tx_id, patch=patch, reason=reason)
+
+
+def resolve_review_transaction(layout: Layout, *, tx_id: str, patch: dict[str, Any], reason: str = "review_resolve") -> dict[str, Any]:
+    evt = _resolve_event(tx_id, patch, reason)
     append_jsonl(layout.corrections_path, evt)
     return evt
+
+
+def resolve_review_transactions(layout: Layout, resolves: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """
+    Resolve several review items at once. Every entry ({"txId", "patch", "reason"?}) is
+    validated before anything is written; the events then go out in one append and one
+    index sync, and are on disk when this returns.
+    """
+    evts = [
+        _resolve_event(r.get("txId"), r.get("patch"), str(r.get("reason") or "review_resolve"))
+        for r in resolves
+    ]
+    append_jsonl_many(layout.corrections_path, evts)
+    return evts
@@ -1,12 +1,19 @@
 from __future__ import annotations
 
-import json
+import asyncio
 import os
+import secrets
+import shutil
+from collections.abc import AsyncIterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from itertools import islice
 from pathlib import Path
 from typing import Any
 
 from fastapi import Body, FastAPI, File, Form, HTTPException, Request, UploadFile
 from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse
+from fastapi.routing import APIRoute
 from fastapi.staticfiles import StaticFiles
 
 from . import __version__
@@ -32,51 +39,37 @@ from .documents import import_and_parse_bill, import_and_parse_receipt
 from .extraction import extract_text, ocr_capabilities
 from .exporting import export_transactions_csv
 from .integration_bank_json import import_bank_json_path
-from .index_db import has_source_hash, index_stats, recent_transactions, rebuild_index
-from .jsonl import read_jsonl
+from .index_db import index_stats, recent_transactions, rebuild_index, source_hashes
+from .jsonl import dumps_json_line, loads_json, read_jsonl
 from .layout import Layout, layout_for
 from .linking import link_bills_to_bank, link_receipts_to_bank
 from .manual import ManualEntry, correction_event, manual_entry_to_tx, parse_amount, tombstone_event
 from .migrations import APP_SCHEMA_VERSION, migrate_to_latest, status as migration_status
 from .ops import collect_metrics
 from .reporting import daily_report_data, render_daily_report_md, monthly_report_data, render_monthly_report_md, write_daily_report, write_monthly_report
-from .review import resolve_review_transaction, review_queue
+from .review import resolve_review_transaction, resolve_review_transactions, review_queue
 from .sources import register_file
-from .storage import append_jsonl, ensure_dir, read_json
+from .storage import append_jsonl, append_jsonl_many, append_line_bytes, ensure_dir, read_json
 from .timeutil import parse_ymd, today_ymd, utc_now_iso
 
 
-def _get_layout(request: Request) -> Layout:
-    layout = getattr(request.app.state, "layout", None)
-    if not isinstance(layout, Layout):
-        raise RuntimeError("App layout not configured")
-    return layout
-
-
 def _save_upload_to_inbox(layout: Layout, upload: UploadFile) -> Path:
-    base = Path(upload.filename or "upload.bin").name  # strips any path parts
+    base = Path(upload.filename or "upload.bin").name or "upload.bin"  # strips any path parts
     target_dir = layout.inbox_dir / "uploads"
     ensure_dir(target_dir)
 
-    # Avoid collisions by suffixing if necessary.
+    # O_EXCL claims the name atomically, so concurrent uploads can't overwrite each other.
+    # On a collision, a random suffix keeps this at one attempt regardless of history.
     candidate = target_dir / base
-    if candidate.exists():
-        stem = candidate.stem
-        suffix = candidate.suffix
-        i = 1
-        while True:
-            c = target_dir / f"{stem}.{i}{suffix}"
-            if not c.exists():
-                candidate = c
-                break
-            i += 1
-
-    with candidate.open("wb") as f:
-        while True:
-            chunk = upload.file.read(1024 * 1024)
-            if not chunk:
-                break
-            f.write(chunk)
+    while True:
+        try:
+            fd = os.open(candidate, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+            break
+        except FileExistsError:
+            candidate = target_dir / f"{Path(base).stem}.{secrets.token_hex(4)}{Path(base).suffix}"
+
+    with os.fdopen(fd, "wb") as f:
+        shutil.copyfileobj(upload.file, f, 1024 * 1024)
     return candidate
 
 
@@ -85,18 +78,18 @@ def _api_key_from_request(request: Request) -> str:
     if header_key:
         return header_key.strip()
     auth = request.headers.get("authorization") or ""
-    if auth.lower().startswith("bearer "):
+    # Only the scheme needs case-folding, not the whole (possibly long) header value.
+    if auth[:7].lower() == "bearer ":
         return auth[7:].strip()
     return ""
 
 
+_LOCAL_HOSTS = frozenset({"127.0.0.1", "::1", "localhost", "testclient"})
+
+
 def _is_local_client(request: Request) -> bool:
     host = (request.client.host if request.client else "") or ""
-    if host in ("127.0.0.1", "::1", "localhost", "testclient"):
-        return True
-    if host.startswith("127."):
-        return True
-    return False
+    return host in _LOCAL_HOSTS or host.startswith("127.")
 
 
 def _parse_json_form_field(value: str | None) -> dict[str, Any] | None:
@@ -105,7 +98,7 @@ def _parse_json_form_field(value: str | None) -> dict[str, Any] | None:
     s = str(value).strip()
     if not s:
         return None
-    raw = json.loads(s)
+    raw = loads_json(s)
     if not isinstance(raw, dict):
         raise ValueError("mapping must be a JSON object")
     return {str(k): str(v) for k, v in raw.items() if v is not None}
@@ -156,8 +149,13 @@ def _import_csv_from_path(
     errors = 0
     samples: list[dict[str, Any]] = []
 
+    # Hashes already imported for this doc, loaded once instead of queried per row.
+    existing = source_hashes(layout, doc_id=doc_id) if commit else set()
+    pending: list[dict[str, Any]] = []
     maxn = max_rows if max_rows is not None else len(rows)
-    for i, row in enumerate(rows[:maxn], start=1):
+    if maxn < 0:
+        maxn = max(0, len(rows) + maxn)  # same rows as the old rows[:maxn] slice
+    for i, row in enumerate(islice(rows, maxn), start=1):
         try:
             tx = csv_row_to_tx(
                 doc_id=doc_id,
@@ -174,15 +172,19 @@ def _import_csv_from_path(
 
         if commit:
             h = tx["source"]["sourceHash"]
-            if has_source_hash(layout, doc_id=doc_id, source_hash=h):
+            if h in existing:
                 skipped += 1
                 continue
-            append_jsonl(layout.transactions_path, tx)
+            existing.add(h)
+            pending.append(tx)
             imported += 1
         else:
             if len(samples) < sample:
                 samples.append(tx)
 
+    # One write (and one index session) for the whole import instead of one per row.
+    append_jsonl_many(layout.transactions_path, pending)
+
     return {
         "mode": "commit" if commit else "dry-run",
         "docId": doc_id,
@@ -195,25 +197,61 @@ def _import_csv_from_path(
 
 def create_app(data_dir: str | None = None) -> FastAPI:
     data_dir = data_dir or os.environ.get("LEDGERFLOW_DATA_DIR") or "data"
-    app = FastAPI(title="LedgerFlow", version=__version__)
+    # Audit appends run off the event loop; one worker keeps them in request-completion order.
+    def new_audit_pool() -> ThreadPoolExecutor:
+        return ThreadPoolExecutor(max_workers=1, thread_name_prefix="ledgerflow-audit")
+
+    audit_pool = new_audit_pool()
+
+    @asynccontextmanager
+    async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+        nonlocal audit_pool
+        # Every startup gets a live pool: a shut-down executor rejects new work, and the
+        # audit write swallows errors, so a restarted app would otherwise drop events.
+        previous, audit_pool = audit_pool, new_audit_pool()
+        previous.shutdown(wait=True)
+        try:
+            yield
+        finally:
+            # Lets queued audit writes land, then releases the worker thread.
+            audit_pool.shutdown(wait=True)
 
+    app = FastAPI(title="LedgerFlow", version=__version__, lifespan=lifespan)
+
+    # Handlers close over `layout`; app.state.layout stays for code holding only the app.
     layout = layout_for(data_dir)
     app.state.layout = layout
     key_store = load_api_key_store_from_env()
     app.state.api_keys = key_store
     app.state.api_key_required = bool(key_store)
-    app.state.auth_mode = auth_mode_for_store(key_store)
+    auth_mode = auth_mode_for_store(key_store)
+    app.state.auth_mode = auth_mode
 
     # Ensure directories exist, but do not write defaults automatically.
     init_data_layout(layout, write_defaults=False)
 
+    # (method, path) -> required scopes for every fixed-path API route, filled in once all
+    # routes are registered. Parameterised and unknown paths go through
+    # required_scopes_for_request; the table only caches its answers.
+    scope_table: dict[tuple[str, str], list[str] | None] = {}
+    audit_log_path = os.fspath(layout.audit_log_path)
+    # Report GETs build their paths by string formatting from these rather than Path joins.
+    daily_reports_dir = os.fspath(layout.reports_dir / "daily")
+    monthly_reports_dir = os.fspath(layout.reports_dir / "monthly")
+
     @app.middleware("http")
     async def auth_and_audit_middleware(request: Request, call_next):  # type: ignore[no-untyped-def]
         path = request.url.path
         method = request.method.upper()
         is_api = path.startswith("/api/")
         is_local = _is_local_client(request)
-        required_scopes = required_scopes_for_request(method, path) if is_api else None
+        required_scopes = None
+        if is_api:
+            route_key = (method, path)
+            if route_key in scope_table:
+                required_scopes = scope_table[route_key]
+            else:
+                required_scopes = required_scopes_for_request(method, path)
         requires_auth = bool(key_store) and (required_scopes is not None)
         denied = False
         deny_reason = None
@@ -230,7 +268,7 @@ def create_app(data_dir: str | None = None) -> FastAPI:
             else:
                 missing_scope = None
                 for req_scope in (required_scopes or []):
-                    deny_reason2 = scope_denial_reason(key_meta, str(req_scope))
+                    deny_reason2 = scope_denial_reason(key_meta, req_scope)
                     if deny_reason2 == "api_key_disabled":
                         denied = True
                         deny_reason = deny_reason2
@@ -242,7 +280,7 @@ def create_app(data_dir: str | None = None) -> FastAPI:
                         response = JSONResponse(status_code=401, content={"detail": "API key has expired"})
                         break
                     if deny_reason2 == "insufficient_scope":
-                        missing_scope = str(req_scope)
+                        missing_scope = req_scope
                         break
                 if not denied and missing_scope:
                     denied = True
@@ -274,20 +312,23 @@ def create_app(data_dir: str | None = None) -> FastAPI:
                 "at": utc_now_iso(),
                 "method": method,
                 "path": path,
-                "query": str(request.url.query or ""),
-                "status": int(getattr(response, "status_code", 0) or 0),
+                "query": request.url.query,
+                "status": response.status_code,
                 "client": (request.client.host if request.client else None),
                 "userAgent": request.headers.get("user-agent"),
                 "authRequired": requires_auth,
-                "authScopesRequired": list(required_scopes or []),
+                # May be the shared scope_table list; it is serialized before anyone else sees it.
+                "authScopesRequired": required_scopes or [],
                 "authKeyId": auth_key_id,
                 "workspaceId": workspace_id,
-                "authMode": str(getattr(app.state, "auth_mode", "unknown")),
+                "authMode": auth_mode,
                 "authDenied": denied,
                 "authDenyReason": deny_reason,
             }
             try:
-                append_jsonl(layout.audit_log_path, evt)
+                # One write() and no ledger-index hook; see storage.append_line_bytes. Awaited,
+                # so the event is on disk before the response goes out.
+                await asyncio.get_running_loop().run_in_executor(audit_pool, append_line_bytes, audit_log_path, dumps_json_line(evt))
             except Exception:
                 pass
 
@@ -303,7 +344,6 @@ def create_app(data_dir: str | None = None) -> FastAPI:
 
     @app.get("/api/health")
     def health(request: Request) -> dict[str, Any]:
-        layout = _get_layout(request)
         return {
             "status": "ok",
             "version": __version__,
@@ -367,7 +407,6 @@ def create_app(data_dir: str | None = None) -> FastAPI:
         image_provider: str = Form(default="auto"),
         preprocess: bool = Form(default=True),
     ) -> dict[str, Any]:
-        layout = _get_layout(request)
         saved = _save_upload_to_inbox(layout, file)
         try:
             text, meta = extract_text(saved, image_provider=str(image_provider), preprocess=bool(preprocess))
@@ -377,7 +416,6 @@ def create_app(data_dir: str | None = None) -> FastAPI:
 
     @app.post("/api/ocr/extract-path")
     def api_ocr_extract_path(request: Request, payload: dict[str, Any] = Body(...)) -> dict[str, Any]:
-        _ = _get_layout(request)
         path = str(payload.get("path") or "").strip()
         if not path:
             raise HTTPException(status_code=400, detail="path is required")
@@ -393,46 +431,38 @@ def create_app(data_dir: str | None = None) -> FastAPI:
 
     @app.post("/api/init")
     def api_init(request: Request, write_defaults: bool = Body(default=False)) -> dict[str, Any]:
-        layout = _get_layout(request)
         init_data_layout(layout, write_defaults=bool(write_defaults))
         return {"ok": True, "dataDir": str(layout.data_dir)}
 
     @app.post("/api/index/rebuild")
     def api_index_rebuild(request: Request) -> dict[str, Any]:
-        layout = _get_layout(request)
         return rebuild_index(layout)
 
     @app.get("/api/index/stats")
     def api_index_stats(request: Request) -> dict[str, Any]:
-        layout = _get_layout(request)
         return index_stats(layout)
 
     @app.get("/api/migrate/status")
     def api_migrate_status(request: Request) -> dict[str, Any]:
-        layout = _get_layout(request)
         return migration_status(layout)
 
     @app.post("/api/migrate/up")
     def api_migrate_up(request: Request, payload: dict[str, Any] = Body(default={})) -> dict[str, Any]:
-        layout = _get_layout(request)
         target = int(payload.get("to") or APP_SCHEMA_VERSION)
         return migrate_to_latest(layout, target_version=target)
 
     @app.get("/api/transactions")
     def api_transactions(request: Request, limit: int = 50) -> dict[str, Any]:
-        layout = _get_layout(request)
         items = recent_transactions(layout, limit=limit, include_deleted=False)
         return {"items": items}
 
     @app.get("/api/corrections")
     def api_corrections(request: Request, limit: int = 50) -> dict[str, Any]:
-        layout = _get_layout(request)
         items = read_jsonl(layout.corrections_path, limit=limit)
         return {"items": items}
 
     @app.get("/api/sources")
     def api_sources(request: Request, limit: int = 200) -> dict[str, Any]:
-        layout = _get_layout(request)
         idx = read_json(layout.sources_index_path, {"version": 1, "docs": []})
         docs = idx.get("docs", [])
         if isinstance(docs, list) and limit is not None and limit >= 0:
@@ -445,7 +475,6 @@ def create_app(data_dir: str | None = None) -> FastAPI:
 
     @app.get("/api/review/queue")
     def api_review_queue(request: Request, date: str | None = None, limit: int = 200) -> dict[str, Any]:
-        layout = _get_layout(request)
         try:
             return review_queue(layout, date=date, limit=limit)
         except ValueError as e:
@@ -453,7 +482,15 @@ def create_app(data_dir: str | None = None) -> FastAPI:
 
     @app.post("/api/review/resolve")
     def api_review_resolve(request: Request, payload: dict[str, Any] = Body(...)) -> dict[str, Any]:
-        layout = _get_layout(request)
+        if "items" in payload:
+            batch = payload.get("items")
+            if not isinstance(batch, list) or not batch or not all(isinstance(r, dict) for r in batch):
+                raise HTTPException(status_code=400, detail="items must be a non-empty list of objects")
+            try:
+                evts = resolve_review_transactions(layout, batch)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e)) from e
+            return {"events": evts}
         tx_id = str(payload.get("txId") or "").strip()
         patch = payload.get("patch")
         reason = str(payload.get("reason") or "review_resolve")
@@ -469,7 +506,6 @@ def create_app(data_dir: str | None = None) -> FastAPI:
 
     @app.post("/api/build")
     def api_build(request: Request, payload: dict[str, Any] = Body(default={})) -> dict[str, Any]:
-        layout = _get_layout(request)
         summary = build_daily_monthly_caches(
             layout,
             from_date=payload.get("fromDate"),
@@ -480,7 +516,6 @@ def create_app(data_dir: str | None = None) -> FastAPI:
 
     @app.post("/api/report/daily")
     def api_report_daily(request: Request, payload: dict[str, Any] = Body(default={})) -> dict[str, Any]:
-        layout = _get_layout(request)
         date = str(payload.get("date") or today_ymd())
         parse_ymd(date)
         paths = write_daily_report(layout, date=date)
@@ -488,16 +523,15 @@ def create_app(data_dir: str | None = None) -> FastAPI:
 
     @app.get("/api/report/daily/{ymd}")
     def api_report_daily_get(request: Request, ymd: str) -> PlainTextResponse:
-        layout = _get_layout(request)
         parse_ymd(ymd)
-        p = layout.reports_dir / "daily" / f"{ymd}.md"
-        if not p.exists():
+        p = f"{daily_reports_dir}/{ymd}.md"
+        if not os.path.isfile(p):
             raise HTTPException(status_code=404, detail="daily report not found")
-        return PlainTextResponse(p.read_text(encoding="utf-8"))
+        with open(p, "rb") as f:
+            return PlainTextResponse(f.read().decode("utf-8"))
 
     @app.post("/api/report/monthly")
     def api_report_monthly(request: Request, payload: dict[str, Any] = Body(default={})) -> dict[str, Any]:
-        layout = _get_layout(request)
         month = str(payload.get("month") or "").strip()
         if not month or len(month) != 7 or month[4] != "-":
             raise HTTPException(status_code=400, detail="month must be YYYY-MM")
@@ -506,17 +540,16 @@ def create_app(data_dir: str | None = None) -> FastAPI:
 
     @app.get("/api/report/monthly/{month}")
     def api_report_monthly_get(request: Request, month: str) -> PlainTextResponse:
-        layout = _get_layout(request)
         if not month or len(month) != 7 or month[4] != "-":
             raise HTTPException(status_code=400, detail="month must be YYYY-MM")
-        p = layout.reports_dir / "monthly" / f"{month}.md"
-        if not p.exists():
+        p = f"{monthly_reports_dir}/{month}.md"
+        if not os.path.isfile(p):
             raise HTTPException(status_code=404, detail="monthly report not found")
-        return PlainTextResponse(p.read_text(encoding="utf-8"))
+        with open(p, "rb") as f:
+            return PlainTextResponse(f.read().decode("utf-8"))
 
     @app.post("/api/charts/series")
     def api_charts_series(request: Request, payload: dict[str, Any] = Body(...)) -> dict[str, Any]:
-        layout = _get_layout(request)
         from_date = str(payload.get("fromDate") or "")
         to_date = str(payload.get("toDate") or "")
         parse_ymd(from_date)
@@ -526,7 +559,6 @@ def create_app(data_dir: str | None = None) -> FastAPI:
 
     @app.post("/api/charts/month")
     def api_charts_month(request: Request, payload: dict[str, Any] = Body(...)) -> dict[str, Any]:
-        layout = _get_layout(request)
         month = str(payload.get("month") or "").strip()
         if not month or len(month) != 7 or month[4] != "-":
             raise HTTPException(status_code=400, detail="month must be YYYY-MM")
@@ -536,7 +568,6 @@ def create_app(data_dir: str | None = None) -> FastAPI:
 
     @app.post("/api/ai/analyze")
     def api_ai_analyze(request: Request, payload: dict[str, Any] = Body(default={})) -> dict[str, Any]:
-        layout = _get_layout(request)
         month = str(payload.get("month") or today_ymd()[:7]).strip()
         provider = str(payload.get("provider") or "auto")
         model = payload.get("model")
@@ -556,24 +587,20 @@ def create_app(data_dir: str | None = None) -> FastAPI:
 
     @app.get("/api/automation/tasks")
     def api_automation_tasks(request: Request, limit: int = 100, status: str | None = None) -> dict[str, Any]:
-        layout = _get_layout(request)
         items = list_tasks(layout, limit=limit, status=status)
         return {"items": items, "count": len(items)}
 
     @app.get("/api/automation/stats")
     def api_automation_stats(request: Request) -> dict[str, Any]:
-        layout = _get_layout(request)
         return queue_stats(layout)
 
     @app.get("/api/automation/dead-letters")
     def api_automation_dead_letters(request: Request, limit: int = 50) -> dict[str, Any]:
-        layout = _get_layout(request)
         items = list_dead_letters(layout, limit=limit)
         return {"items": items, "count": len(items)}
 
     @app.post("/api/automation/tasks")
     def api_automation_enqueue(request: Request, payload: dict[str, Any] = Body(...)) -> dict[str, Any]:
-        layout = _get_layout(request)
         task_type = str(payload.get("taskType") or "").strip()
         if not task_type:
             raise HTTPException(status_code=400, detail="taskType is required")
@@ -594,18 +621,15 @@ def create_app(data_dir: str | None = None) -> FastAPI:
 
     @app.post("/api/automation/run-next")
     def api_automation_run_next(request: Request, payload: dict[str, Any] = Body(default={})) -> dict[str, Any]:
-        layout = _get_layout(request)
         worker_id = str(payload.get("workerId") or "api-worker")
         return run_next_task(layout, worker_id=worker_id)
 
     @app.post("/api/automation/run-due")
     def api_automation_run_due(request: Request, payload: dict[str, Any] = Body(default={})) -> dict[str, Any]:
-        layout = _get_layout(request)
         return enqueue_due_jobs(layout, at=(str(payload["at"]) if payload.get("at") else None))
 
     @app.post("/api/automation/dispatch")
     def api_automation_dispatch(request: Request, payload: dict[str, Any] = Body(default={})) -> dict[str, Any]:
-        layout = _get_layout(request)
         return dispatch_due_and_work(
             layout,
             run_due=bool(payload.get("runDue") if "runDue" in payload else True),
@@ -617,12 +641,10 @@ def create_app(data_dir: str | None = None) -> FastAPI:
 
     @app.get("/api/automation/jobs")
     def api_automation_jobs(request: Request) -> dict[str, Any]:
-        layout = _get_layout(request)
         return read_jobs(layout)
 
     @app.post("/api/automation/jobs")
     def api_automation_jobs_set(request: Request, payload: dict[str, Any] = Body(...)) -> dict[str, Any]:
-        layout = _get_layout(request)
         try:
             return write_jobs(layout, payload)
         except ValueError as e:
@@ -630,7 +652,6 @@ def create_app(data_dir: str | None = None) -> FastAPI:
 
     @app.post("/api/backup/create")
     def api_backup_create(request: Request, payload: dict[str, Any] = Body(default={})) -> dict[str, Any]:
-        layout = _get_layout(request)
         return create_backup(
             layout,
             out_path=(str(payload["outPath"]) if payload.get("outPath") else None),
@@ -639,7 +660,6 @@ def create_app(data_dir: str | None = None) -> FastAPI:
 
     @app.post("/api/backup/restore")
     def api_backup_restore(request: Request, payload: dict[str, Any] = Body(...)) -> dict[str, Any]:
-        _ = _get_layout(request)
         archive_path = str(payload.get("archivePath") or "").strip()
         target_dir = str(payload.get("targetDir") or "").strip()
         if not archive_path:
@@ -657,12 +677,10 @@ def create_app(data_dir: str | None = None) -> FastAPI:
 
     @app.get("/api/ops/metrics")
     def api_ops_metrics(request: Request) -> dict[str, Any]:
-        layout = _get_layout(request)
         return collect_metrics(layout)
 
     @app.post("/api/alerts/run")
     def api_alerts_run(request: Request, payload: dict[str, Any] = Body(default={})) -> dict[str, Any]:
-        layout = _get_layout(request)
         at = str(payload.get("at") or today_ymd())
         parse_ymd(at)
         res = run_alerts(layout, at_date=at, commit=bool(payload.get("commit") if "commit" in payload else True))
@@ -670,13 +688,11 @@ def create_app(data_dir: str | None = None) -> FastAPI:
 
     @app.get("/api/alerts/events")
     def api_alerts_events(request: Request, limit: int = 50) -> dict[str, Any]:
-        layout = _get_layout(request)
         items = read_jsonl(layout.alerts_dir / "events.jsonl", limit=limit)
         return {"items": items}
 
     @app.post("/api/alerts/deliver")
     def api_alerts_deliver(request: Request, payload: dict[str, Any] = Body(default={})) -> dict[str, Any]:
-        layout = _get_layout(request)
         raw_channels = payload.get("channels")
         channels: list[str] | None = None
         if isinstance(raw_channels, list):
@@ -691,19 +707,16 @@ def create_app(data_dir: str | None = None) -> FastAPI:
 
     @app.get("/api/alerts/outbox")
     def api_alerts_outbox(request: Request, limit: int = 50) -> dict[str, Any]:
-        layout = _get_layout(request)
         items = list_outbox_entries(layout, limit=limit)
         return {"items": items}
 
     @app.get("/api/audit/events")
     def api_audit_events(request: Request, limit: int = 100) -> dict[str, Any]:
-        layout = _get_layout(request)
         items = read_jsonl(layout.audit_log_path, limit=limit)
         return {"items": items}
 
     @app.post("/api/export/csv")
     def api_export_csv(request: Request, payload: dict[str, Any] = Body(default={})) -> FileResponse:
-        layout = _get_layout(request)
         out_dir = layout.data_dir / "exports"
         ensure_dir(out_dir)
         out_path = out_dir / "transactions.csv"
@@ -721,7 +734,6 @@ def create_app(data_dir: str | None = None) -> FastAPI:
         request: Request,
         payload: dict[str, Any] = Body(...),
     ) -> dict[str, Any]:
-        layout = _get_layout(request)
 
         occurred_at = payload.get("occurredAt") or today_ymd()
         parse_ymd(occurred_at)
@@ -751,7 +763,6 @@ def create_app(data_dir: str | None = None) -> FastAPI:
 
     @app.post("/api/manual/edit")
     def api_manual_edit(request: Request, payload: dict[str, Any] = Body(...)) -> dict[str, Any]:
-        layout = _get_layout(request)
 
         tx_id = str(payload.get("txId") or "").strip()
         if not tx_id:
@@ -770,7 +781,6 @@ def create_app(data_dir: str | None = None) -> FastAPI:
 
     @app.post("/api/manual/delete")
     def api_manual_delete(request: Request, payload: dict[str, Any] = Body(...)) -> dict[str, Any]:
-        layout = _get_layout(request)
         tx_id = str(payload.get("txId") or "").strip()
         if not tx_id:
             raise HTTPException(status_code=400, detail="txId is required")
@@ -780,7 +790,6 @@ def create_app(data_dir: str | None = None) -> FastAPI:
 
     @app.post("/api/manual/bulk-add")
     def api_manual_bulk_add(request: Request, payload: list[dict[str, Any]] = Body(...)) -> dict[str, Any]:
-        layout = _get_layout(request)
         created = 0
         tx_ids: list[str] = []
         for obj in payload:
@@ -824,7 +833,6 @@ def create_app(data_dir: str | None = None) -> FastAPI:
         copy_into_sources: bool = Form(default=False),
         source_type: str | None = Form(default=None),
     ) -> dict[str, Any]:
-        layout = _get_layout(request)
         saved = _save_upload_to_inbox(layout, file)
         doc = register_file(
             layout.sources_dir,
@@ -855,7 +863,6 @@ def create_app(data_dir: str | None = None) -> FastAPI:
         credit_col: str | None = Form(default=None),
         currency_col: str | None = Form(default=None),
     ) -> JSONResponse:
-        layout = _get_layout(request)
         saved = _save_upload_to_inbox(layout, file)
 
         result = _import_csv_from_path(
@@ -892,7 +899,6 @@ def create_app(data_dir: str | None = None) -> FastAPI:
         max_rows: int | None = Form(default=None),
         mapping_json: str | None = Form(default=None),
     ) -> JSONResponse:
-        layout = _get_layout(request)
         saved = _save_upload_to_inbox(layout, file)
         try:
             mapping = _parse_json_form_field(mapping_json)
@@ -920,7 +926,6 @@ def create_app(data_dir: str | None = None) -> FastAPI:
         image_provider: str = Form(default="auto"),
         preprocess: bool = Form(default=True),
     ) -> JSONResponse:
-        layout = _get_layout(request)
         saved = _save_upload_to_inbox(layout, file)
         try:
             res = import_and_parse_receipt(
@@ -944,7 +949,6 @@ def create_app(data_dir: str | None = None) -> FastAPI:
         image_provider: str = Form(default="auto"),
         preprocess: bool = Form(default=True),
     ) -> JSONResponse:
-        layout = _get_layout(request)
         saved = _save_upload_to_inbox(layout, file)
         try:
             res = import_and_parse_bill(
@@ -961,7 +965,6 @@ def create_app(data_dir: str | None = None) -> FastAPI:
 
     @app.post("/api/link/receipts")
     def api_link_receipts(request: Request, payload: dict[str, Any] = Body(default={})) -> dict[str, Any]:
-        layout = _get_layout(request)
         return link_receipts_to_bank(
             layout,
             max_days_diff=int(payload.get("maxDaysDiff") or 3),
@@ -971,7 +974,6 @@ def create_app(data_dir: str | None = None) -> FastAPI:
 
     @app.post("/api/link/bills")
     def api_link_bills(request: Request, payload: dict[str, Any] = Body(default={})) -> dict[str, Any]:
-        layout = _get_layout(request)
         return link_bills_to_bank(
             layout,
             max_days_diff=int(payload.get("maxDaysDiff") or 7),
@@ -981,7 +983,6 @@ def create_app(data_dir: str | None = None) -> FastAPI:
 
     @app.post("/api/dedup/manual-vs-bank")
     def api_dedup_manual_vs_bank(request: Request, payload: dict[str, Any] = Body(default={})) -> dict[str, Any]:
-        layout = _get_layout(request)
         return mark_manual_duplicates_against_bank(
             layout,
             from_date=payload.get("fromDate"),
@@ -993,7 +994,6 @@ def create_app(data_dir: str | None = None) -> FastAPI:
 
     @app.post("/api/import/csv-path")
     def api_import_csv_path(request: Request, payload: dict[str, Any] = Body(...)) -> JSONResponse:
-        layout = _get_layout(request)
         path = str(payload.get("path") or "").strip()
         if not path:
             raise HTTPException(status_code=400, detail="path is required")
@@ -1022,7 +1022,6 @@ def create_app(data_dir: str | None = None) -> FastAPI:
 
     @app.post("/api/import/bank-json-path")
     def api_import_bank_json_path(request: Request, payload: dict[str, Any] = Body(...)) -> JSONResponse:
-        layout = _get_layout(request)
         path = str(payload.get("path") or "").strip()
         if not path:
             raise HTTPException(status_code=400, detail="path is required")
@@ -1046,7 +1045,6 @@ def create_app(data_dir: str | None = None) -> FastAPI:
 
     @app.post("/api/import/connector-path")
     def api_import_connector_path(request: Request, payload: dict[str, Any] = Body(...)) -> JSONResponse:
-        layout = _get_layout(request)
         connector = str(payload.get("connector") or "").strip()
         path = str(payload.get("path") or "").strip()
         if not connector:
@@ -1068,4 +1066,9 @@ def create_app(data_dir: str | None = None) -> FastAPI:
             raise HTTPException(status_code=400, detail=str(e)) from e
         return JSONResponse(out)
 
+    for route in app.routes:
+        if isinstance(route, APIRoute) and route.path.startswith("/api/") and "{" not in route.path:
+            for m in route.methods or ():
+                scope_table[(m, route.path)] = required_scopes_for_request(m, route.path)
+
     return app
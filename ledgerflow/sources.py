@@ -14,6 +14,30 @@ def _index_default() -> dict[str, Any]:
     return {"version": 1, "docs": []}
 
 
+# index path -> ((mtime_ns, size, ino), parsed docs); the index is rewritten, not appended.
+_INDEX_DOCS_MEMO: dict[Path, tuple[tuple[int, int, int], tuple[Any, ...]]] = {}
+
+
+def index_docs(index_path: Path) -> tuple[Any, ...]:
+    """
+    The index's "docs" entries, re-read only when the file's mtime, size or inode changes.
+    The tuple is shared between callers; the doc dicts in it must be treated as read-only.
+    """
+    try:
+        st = index_path.stat()
+    except FileNotFoundError:
+        return ()
+    key = (st.st_mtime_ns, st.st_size, st.st_ino)
+    hit = _INDEX_DOCS_MEMO.get(index_path)
+    if hit is not None and hit[0] == key:
+        return hit[1]
+    idx = read_json(index_path, _index_default())
+    docs = idx.get("docs", []) if isinstance(idx, dict) else []
+    docs = tuple(docs) if isinstance(docs, list) else ()
+    _INDEX_DOCS_MEMO[index_path] = (key, docs)
+    return docs
+
+
 def register_file(
     layout_sources_dir: Path,
     index_path: Path,
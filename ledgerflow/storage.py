@@ -1,9 +1,12 @@
 from __future__ import annotations
 
 import json
+import os
 from pathlib import Path
 from typing import Any
 
+from .jsonl import loads_json
+
 
 def ensure_dir(path: str | Path) -> Path:
     p = Path(path)
@@ -13,10 +16,11 @@ def ensure_dir(path: str | Path) -> Path:
 
 def read_json(path: str | Path, default: Any) -> Any:
     p = Path(path)
-    if not p.exists():
+    try:
+        raw = p.read_bytes()
+    except FileNotFoundError:
         return default
-    with p.open("r", encoding="utf-8") as f:
-        return json.load(f)
+    return loads_json(raw)
 
 
 def write_json(path: str | Path, obj: Any) -> None:
@@ -42,3 +46,43 @@ def append_jsonl(path: str | Path, obj: Any) -> None:
     except Exception:
         # Index updates are best-effort; file append remains source of truth.
         pass
+
+
+def append_jsonl_many(path: str | Path, objs: list[Any]) -> None:
+    """
+    Append several objects with a single write, then sync the sqlite index once.
+    Same file format as repeated append_jsonl calls.
+    """
+    if not objs:
+        return
+    p = Path(path)
+    ensure_dir(p.parent)
+    with p.open("a", encoding="utf-8") as f:
+        f.write("".join(json.dumps(obj, ensure_ascii=False) + "\n" for obj in objs))
+
+    try:
+        from .index_db import hook_after_append_many
+
+        hook_after_append_many(p, objs)
+    except Exception:
+        # Index updates are best-effort; file append remains source of truth.
+        pass
+
+
+def append_line_bytes(path: str | Path, line: bytes) -> None:
+    """
+    Append one pre-serialized line (including its newline) with a single O_APPEND write.
+    For logs outside the ledger: unlike append_jsonl, the sqlite index is not touched.
+    """
+    flags = os.O_WRONLY | os.O_APPEND | os.O_CREAT
+    try:
+        fd = os.open(path, flags, 0o644)
+    except FileNotFoundError:
+        ensure_dir(Path(path).parent)
+        fd = os.open(path, flags, 0o644)
+    try:
+        view = memoryview(line)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
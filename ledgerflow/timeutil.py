@@ -1,11 +1,22 @@
 from __future__ import annotations
 
+import time
 from datetime import date, datetime, timezone
 
+# (unix second, its ISO string): bulk writers stamp thousands of rows within one second.
+# Swapped as a single tuple so concurrent callers never pair a second with another's text.
+_NOW_ISO: tuple[int, str] = (-1, "")
+
 
 def utc_now_iso() -> str:
     # ISO8601 with second precision, Z suffix.
-    return datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
+    global _NOW_ISO
+    sec = int(time.time())
+    cached_sec, iso = _NOW_ISO
+    if sec != cached_sec:
+        iso = datetime.fromtimestamp(sec, timezone.utc).isoformat().replace("+00:00", "Z")
+        _NOW_ISO = (sec, iso)
+    return iso
 
 
 def today_ymd() -> str:
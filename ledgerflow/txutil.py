@@ -66,6 +66,21 @@ def parse_ymd(value: str) -> date:
     return datetime.strptime(value, "%Y-%m-%d").date()
 
 
+def ymd_ordinal(value: str) -> int | None:
+    """parse_ymd(value).toordinal(), or None when value is not a %Y-%m-%d date."""
+    # Zero-padded dates (nearly all ledger dates) skip strptime; anything else it accepts,
+    # such as "2026-2-3", still goes through it.
+    if len(value) == 10 and value[4] == "-" and value[7] == "-" and value.isascii():
+        try:
+            return date.fromisoformat(value).toordinal()
+        except ValueError:
+            pass
+    try:
+        return parse_ymd(value).toordinal()
+    except ValueError:
+        return None
+
+
 def daterange(from_date: str, to_date: str) -> list[str]:
     start = parse_ymd(from_date)
     end = parse_ymd(to_date)
@@ -2,12 +2,14 @@ from __future__ import annotations
 
 import json
 import tempfile
+import threading
 import unittest
 from pathlib import Path
 from unittest.mock import patch
 
 from fastapi.testclient import TestClient
 
+from ledgerflow.layout import layout_for
 from ledgerflow.server import create_app
 
 
@@ -54,6 +56,30 @@ class TestApi(unittest.TestCase):
             txs = client.get("/api/transactions?limit=10").json()["items"]
             self.assertEqual(len(txs), 1)
 
+    def test_shutdown_releases_audit_worker(self) -> None:
+        def audit_threads() -> set[threading.Thread]:
+            return {t for t in threading.enumerate() if t.name.startswith("ledgerflow-audit")}
+
+        with tempfile.TemporaryDirectory() as td:
+            before = audit_threads()
+            data_dir = Path(td) / "data"
+            with TestClient(create_app(str(data_dir))) as client:
+                self.assertEqual(client.post("/api/review/resolve", json={}).status_code, 400)
+                self.assertTrue(audit_threads() - before)
+            self.assertFalse(audit_threads() - before)
+            audit = layout_for(data_dir).audit_log_path.read_text(encoding="utf-8")
+            self.assertEqual(len(audit.splitlines()), 1)
+
+    def test_restarted_app_keeps_writing_audit_events(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            data_dir = Path(td) / "data"
+            app = create_app(str(data_dir))
+            for _ in range(2):
+                with TestClient(app) as client:
+                    self.assertEqual(client.post("/api/review/resolve", json={}).status_code, 400)
+            audit = layout_for(data_dir).audit_log_path.read_text(encoding="utf-8")
+            self.assertEqual(len(audit.splitlines()), 2)
+
     def test_ocr_extract_path_endpoint(self) -> None:
         with tempfile.TemporaryDirectory() as td:
             data_dir = Path(td) / "data"
@@ -136,6 +162,7 @@ class TestApi(unittest.TestCase):
             g = client.get("/api/report/daily/2026-02-10")
             self.assertEqual(g.status_code, 200)
             self.assertIn("Daily Report", g.text)
+            self.assertEqual(client.get("/api/report/daily/2026-02-11").status_code, 404)
 
             # Monthly report create + fetch.
             rm = client.post("/api/report/monthly", json={"month": "2026-02"})
@@ -225,6 +252,17 @@ class TestApi(unittest.TestCase):
             items2 = q2.json()["items"]
             self.assertFalse(any((i.get("txId") == tx_id and i.get("kind") == "transaction") for i in items2))
 
+            bad = client.post("/api/review/resolve", json={"items": [{"txId": tx_id, "patch": {"tags": ["a"]}}, {"txId": tx_id}]})
+            self.assertEqual(bad.status_code, 400)
+            rb = client.post(
+                "/api/review/resolve",
+                json={"items": [{"txId": tx_id, "patch": {"tags": ["a"]}}, {"txId": tx_id, "patch": {"tags": ["b"]}, "reason": "bulk"}]},
+            )
+            self.assertEqual(rb.status_code, 200)
+            self.assertEqual([e["reason"] for e in rb.json()["events"]], ["review_resolve", "bulk"])
+            tx = client.get("/api/transactions?limit=10").json()["items"][0]
+            self.assertEqual(tx["tags"], ["b"])
+
     def test_api_key_auth_and_audit_log(self) -> None:
         with tempfile.TemporaryDirectory() as td:
             data_dir = Path(td) / "data"
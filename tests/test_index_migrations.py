@@ -6,10 +6,10 @@ from pathlib import Path
 
 from ledgerflow.bootstrap import init_data_layout
 from ledgerflow.ids import new_id
-from ledgerflow.index_db import has_source_hash, index_stats, recent_transactions, rebuild_index
+from ledgerflow.index_db import has_source_hash, index_stats, recent_transactions, rebuild_index, source_hashes
 from ledgerflow.layout import layout_for
 from ledgerflow.migrations import APP_SCHEMA_VERSION, migrate_to_latest, status as migration_status
-from ledgerflow.storage import append_jsonl
+from ledgerflow.storage import append_jsonl, append_jsonl_many
 
 
 class TestIndexAndMigrations(unittest.TestCase):
@@ -38,6 +38,8 @@ class TestIndexAndMigrations(unittest.TestCase):
             append_jsonl(layout.transactions_path, tx)
 
             self.assertTrue(has_source_hash(layout, doc_id=doc_id, source_hash="sha256:abc"))
+            self.assertEqual(source_hashes(layout, doc_id=doc_id), {"sha256:abc"})
+            self.assertEqual(source_hashes(layout, doc_id="doc_other"), set())
 
             evt = {
                 "eventId": new_id("evt"),
@@ -53,11 +55,39 @@ class TestIndexAndMigrations(unittest.TestCase):
             self.assertEqual(len(items), 1)
             self.assertEqual(items[0]["merchant"], "B")
 
+            append_jsonl_many(
+                layout.corrections_path,
+                [
+                    {"eventId": new_id("evt"), "txId": tx_id, "type": "patch", "patch": {"merchant": "C"}, "at": "2026-02-10T00:02:00Z"},
+                    {"eventId": new_id("evt"), "txId": tx_id, "type": "patch", "patch": {"merchant": "D"}, "at": "2026-02-10T00:03:00Z"},
+                ],
+            )
+            self.assertEqual(recent_transactions(layout, limit=10)[0]["merchant"], "D")
+            self.assertEqual(index_stats(layout)["corrections"], 3)
+
             stats_before = index_stats(layout)
             self.assertGreaterEqual(stats_before["transactions"], 1)
             rebuild = rebuild_index(layout)
             self.assertGreaterEqual(rebuild["transactionsIndexed"], 1)
 
+    def test_recent_transactions_newest_first(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            layout = layout_for(Path(td) / "data")
+            init_data_layout(layout, write_defaults=True)
+            for day in ("2026-02-01", "2026-02-03", "2026-02-02"):
+                append_jsonl(
+                    layout.transactions_path,
+                    {
+                        "txId": new_id("tx"),
+                        "source": {"docId": "doc_x", "sourceType": "manual", "sourceHash": f"sha256:{day}"},
+                        "occurredAt": day,
+                        "amount": {"value": "-1.00", "currency": "USD"},
+                    },
+                )
+
+            items = recent_transactions(layout, limit=2)
+            self.assertEqual([tx["occurredAt"] for tx in items], ["2026-02-03", "2026-02-02"])
+
     def test_migration_status_and_up(self) -> None:
         with tempfile.TemporaryDirectory() as td:
             layout = layout_for(Path(td) / "data")
@@ -6,7 +6,7 @@ import unittest
 from pathlib import Path
 
 from ledgerflow.bootstrap import init_data_layout
-from ledgerflow.integration_bank_json import import_bank_json_path
+from ledgerflow.integration_bank_json import _parse_amount_value, import_bank_json_path
 from ledgerflow.layout import layout_for
 from ledgerflow.ledger import load_ledger
 
@@ -117,6 +117,15 @@ class TestIntegrationBankJson(unittest.TestCase):
             self.assertEqual(tx["merchant"], "Metro")
             self.assertEqual(tx["amount"]["value"], "-7.25")
 
+    def test_amount_values_are_canonical_decimals(self) -> None:
+        cases = {"-12.30": ("-12.30", True), "-0.00": ("-0.00", False), "+12.50": ("12.50", False), ".5": ("0.5", False)}
+        cases.update({"1_000": ("1000", False), "\u0661\u0662": ("12", False), "007": ("7", False), "-1e2": ("-1E+2", True)})
+        for raw, expected in cases.items():
+            self.assertEqual(_parse_amount_value(raw), expected)
+        for bad in ("abc", "nan", "inf", None):
+            with self.assertRaises(ValueError):
+                _parse_amount_value(bad)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from ledgerflow.bootstrap import init_data_layout
+from ledgerflow.layout import layout_for
+from ledgerflow.ledger import apply_corrections, filter_by_month, group_by_month, iter_ledger, load_ledger
+from ledgerflow.storage import append_jsonl
+
+
+class TestApplyCorrections(unittest.TestCase):
+    def test_patches_do_not_write_through_to_source_txs(self) -> None:
+        raw = [
+            {"txId": "tx_1", "merchant": "", "links": {"receiptDocId": None}, "tags": []},
+            {"txId": "tx_2", "merchant": "Shop", "links": {"receiptDocId": None}},
+        ]
+        evts = [
+            {"txId": "tx_1", "type": "patch", "patch": {"links": {"receiptDocId": "doc_1"}, "merchant": "Cafe"}},
+            {"txId": "tx_1", "type": "patch", "patch": {"tags": ["receipt-linked"]}},
+            {"txId": "tx_2", "type": "tombstone"},
+        ]
+
+        view = apply_corrections(raw, evts)
+
+        self.assertEqual(view.applied_corrections, 3)
+        self.assertEqual(view.deleted_tx_ids, {"tx_2"})
+        self.assertEqual(
+            view.transactions,
+            [{"txId": "tx_1", "merchant": "Cafe", "links": {"receiptDocId": "doc_1"}, "tags": ["receipt-linked"]}],
+        )
+        self.assertEqual(raw[0], {"txId": "tx_1", "merchant": "", "links": {"receiptDocId": None}, "tags": []})
+
+    def test_no_corrections_keeps_only_identified_txs(self) -> None:
+        raw = [{"txId": "tx_1"}, {"txId": ""}, {"merchant": "no id"}, {"txId": 7}, {"txId": "tx_2"}]
+        view = apply_corrections(raw, [])
+        self.assertEqual(view.transactions, [{"txId": "tx_1"}, {"txId": "tx_2"}])
+        self.assertEqual(view.deleted_tx_ids, set())
+        self.assertEqual(view.applied_corrections, 0)
+
+
+class TestLoadLedgerCache(unittest.TestCase):
+    def test_cache_is_reused_and_invalidated_by_appends(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            layout = layout_for(Path(td) / "data")
+            init_data_layout(layout, write_defaults=True)
+            append_jsonl(layout.transactions_path, {"txId": "tx_1", "merchant": "A"})
+            append_jsonl(layout.transactions_path, {"txId": "tx_2", "merchant": "B"})
+
+            first = load_ledger(layout)
+            self.assertTrue(layout.ledger_cache_path.exists())
+            self.assertEqual([t["txId"] for t in first.transactions], ["tx_1", "tx_2"])
+            # Callers get independent dicts on every load, cached or not.
+            first.transactions[0]["merchant"] = "mutated"
+            self.assertEqual(load_ledger(layout).transactions[0]["merchant"], "A")
+
+            append_jsonl(layout.corrections_path, {"txId": "tx_2", "type": "tombstone"})
+            append_jsonl(layout.corrections_path, {"txId": "tx_1", "type": "patch", "patch": {"merchant": "Z"}})
+            view = load_ledger(layout)
+            self.assertEqual(view.transactions, [{"txId": "tx_1", "merchant": "Z"}])
+            self.assertEqual(view.deleted_tx_ids, {"tx_2"})
+            self.assertEqual(len(load_ledger(layout, include_deleted=True).transactions), 2)
+
+            for junk in (b"not a cache", b"[\xff\xff\xff\x7f"):
+                layout.ledger_cache_path.write_bytes(junk)
+                self.assertEqual(load_ledger(layout).transactions, [{"txId": "tx_1", "merchant": "Z"}])
+
+    def test_date_filter_drops_other_days_and_deleted(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            layout = layout_for(Path(td) / "data")
+            init_data_layout(layout, write_defaults=True)
+            append_jsonl(layout.transactions_path, {"txId": "tx_1", "occurredAt": "2026-02-10"})
+            append_jsonl(layout.transactions_path, {"txId": "tx_2", "occurredAt": "2026-02-11"})
+            append_jsonl(layout.transactions_path, {"txId": "tx_3", "postedAt": "2026-02-10"})
+            append_jsonl(layout.corrections_path, {"txId": "tx_3", "type": "tombstone"})
+
+            self.assertEqual([t["txId"] for t in iter_ledger(layout, date="2026-02-10")], ["tx_1"])
+            self.assertEqual([t["txId"] for t in iter_ledger(layout, include_deleted=True, date="2026-02-10")], ["tx_1", "tx_3"])
+            for include_deleted in (False, True):
+                self.assertEqual(
+                    list(iter_ledger(layout, include_deleted=include_deleted)),
+                    load_ledger(layout, include_deleted=include_deleted).transactions,
+                )
+
+
+class TestGroupByMonth(unittest.TestCase):
+    def test_buckets_match_filter_by_month(self) -> None:
+        txs = [
+            {"txId": "a", "occurredAt": "2026-02-03"},
+            {"txId": "b", "postedAt": "2026-01-31"},
+            {"txId": "c", "occurredAt": "2026-02"},
+            {"txId": "d", "occurredAt": "2026"},
+            {"txId": "e"},
+            {"txId": "f", "occurredAt": "2026-02-28"},
+        ]
+        groups = group_by_month(txs)
+        self.assertEqual(list(groups), ["2026-02", "2026-01"])
+        for mo, bucket in groups.items():
+            self.assertEqual(bucket, filter_by_month(txs, mo))
+
+
+if __name__ == "__main__":
+    unittest.main()
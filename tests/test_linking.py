@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from ledgerflow.bootstrap import init_data_layout
+from ledgerflow.layout import layout_for
+from ledgerflow.ledger import load_ledger
+from ledgerflow.linking import _load_receipt_docs, link_bills_to_bank, link_receipts_to_bank
+from ledgerflow.storage import append_jsonl, write_json
+
+
+def _bank_tx(tx_id: str, day: str, value: str, *, currency: str = "USD", description: str = "") -> dict:
+    return {
+        "txId": tx_id,
+        "source": {"docId": "doc_bank", "sourceType": "bank_csv"},
+        "occurredAt": day,
+        "amount": {"value": value, "currency": currency},
+        "description": description,
+        "tags": [],
+        "links": {"receiptDocId": None, "billDocId": None},
+    }
+
+
+def _seed_doc(layout, doc_id: str, source_type: str, parsed: dict) -> None:
+    d = layout.sources_dir / doc_id
+    d.mkdir(parents=True, exist_ok=True)
+    write_json(d / "parse.json", parsed)
+    idx_path = layout.sources_index_path
+    idx = json.loads(idx_path.read_text(encoding="utf-8")) if idx_path.exists() else {"version": 1, "docs": []}
+    idx["docs"].append({"docId": doc_id, "sourceType": source_type})
+    write_json(idx_path, idx)
+
+
+class TestLinking(unittest.TestCase):
+    def test_receipt_links_best_candidate_within_window_and_tolerance(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            layout = layout_for(Path(td) / "data")
+            init_data_layout(layout, write_defaults=True)
+            for tx in [
+                _bank_tx("tx_far", "2026-02-20", "-12.30", description="CAFE ROMA"),
+                _bank_tx("tx_off", "2026-02-10", "-12.40", description="CAFE ROMA"),
+                _bank_tx("tx_eur", "2026-02-10", "-12.30", currency="EUR", description="CAFE ROMA"),
+                _bank_tx("tx_first", "2026-02-11", "-12.30", description="GAS STATION"),
+                _bank_tx("tx_best", "2026-02-12", "-12.30", description="CAFE ROMA"),
+            ]:
+                append_jsonl(layout.transactions_path, tx)
+            _seed_doc(
+                layout,
+                "doc_r1",
+                "receipt",
+                {"date": "2026-02-10", "merchant": "Cafe Roma", "total": {"value": "12.30", "currency": "USD"}},
+            )
+
+            res = link_receipts_to_bank(layout, commit=True)
+            self.assertEqual(res["created"], 1)
+            by_id = {t["txId"]: t for t in load_ledger(layout).transactions}
+            self.assertEqual(by_id["tx_best"]["links"]["receiptDocId"], "doc_r1")
+            self.assertIn("receipt-linked", by_id["tx_best"]["tags"])
+
+    def test_bill_ties_keep_first_bank_tx(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            layout = layout_for(Path(td) / "data")
+            init_data_layout(layout, write_defaults=True)
+            append_jsonl(layout.transactions_path, _bank_tx("tx_a", "2026-03-05", "-80.00", currency=""))
+            append_jsonl(layout.transactions_path, _bank_tx("tx_b", "2026-03-01", "-80.00"))
+            _seed_doc(layout, "doc_b1", "bill", {"dueDate": "2026-03-03", "amount": {"value": "80", "currency": "USD"}})
+
+            res = link_bills_to_bank(layout, commit=True)
+            self.assertEqual(res["created"], 1)
+            by_id = {t["txId"]: t for t in load_ledger(layout).transactions}
+            self.assertEqual(by_id["tx_a"]["links"]["billDocId"], "doc_b1")
+            self.assertIsNone(by_id["tx_b"]["links"]["billDocId"])
+
+    def test_unpadded_bank_dates_still_link(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            layout = layout_for(Path(td) / "data")
+            init_data_layout(layout, write_defaults=True)
+            append_jsonl(layout.transactions_path, _bank_tx("tx_1", "2026-2-11", "-9.99", description="KIOSK"))
+            _seed_doc(layout, "doc_r1", "receipt", {"date": "2026-02-10", "merchant": "Kiosk", "total": {"value": "9.99", "currency": "USD"}})
+
+            self.assertEqual(link_receipts_to_bank(layout, commit=True)["created"], 1)
+            self.assertEqual(load_ledger(layout).transactions[0]["links"]["receiptDocId"], "doc_r1")
+
+    def test_load_receipt_docs_keeps_index_order(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            layout = layout_for(Path(td) / "data")
+            init_data_layout(layout, write_defaults=True)
+            for i in range(12):
+                _seed_doc(layout, f"doc_r{i:02d}", "receipt" if i % 4 else "bill", {"date": "2026-02-10"})
+            (layout.sources_dir / "doc_r05" / "parse.json").unlink()
+
+            ids = [item["doc"]["docId"] for item in _load_receipt_docs(layout)]
+            self.assertEqual(ids, ["doc_r01", "doc_r02", "doc_r03", "doc_r06", "doc_r07", "doc_r09", "doc_r10", "doc_r11"])
+
+
+if __name__ == "__main__":
+    unittest.main()
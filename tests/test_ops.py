@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from ledgerflow.ops import _COUNT_CHUNK, _count_jsonl
+
+
+class TestCountJsonl(unittest.TestCase):
+    def _count(self, data: bytes) -> int:
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "x.jsonl"
+            path.write_bytes(data)
+            return _count_jsonl(path)
+
+    def test_missing_file_counts_zero(self) -> None:
+        self.assertEqual(_count_jsonl(Path(tempfile.gettempdir()) / "ledgerflow-missing.jsonl"), 0)
+
+    def test_blank_and_whitespace_only_lines_are_skipped(self) -> None:
+        self.assertEqual(self._count(b'{"a":1}\n\n  \t\n{"b":2}\r\n\r\n \x0b\x0c\n{"c":3}\n'), 3)
+        self.assertEqual(self._count(b""), 0)
+        self.assertEqual(self._count(b"\n \n"), 0)
+
+    def test_last_line_without_trailing_newline(self) -> None:
+        self.assertEqual(self._count(b'{"a":1}\n{"b":2}'), 2)
+        self.assertEqual(self._count(b'{"a":1}\n   '), 1)
+
+    def test_records_across_chunk_boundaries(self) -> None:
+        # The first record ends a few bytes past the first chunk; a blank line follows it.
+        first = b'{"pad":"' + b"x" * (_COUNT_CHUNK - 4) + b'"}\n'
+        self.assertEqual(self._count(first + b"\n" + b'{"b":2}\n'), 2)
+        # A blank line split across the boundary by leading whitespace.
+        lead = b'{"a":1}\n' * 3
+        spaces = b" " * (_COUNT_CHUNK - len(lead) + 5)
+        self.assertEqual(self._count(lead + spaces + b"\n" + b'{"b":2}'), 4)
+        # One line longer than several chunks, with and without a trailing newline.
+        long_line = b'{"pad":"' + b"y" * (3 * _COUNT_CHUNK) + b'"}'
+        self.assertEqual(self._count(long_line + b"\n" + long_line), 2)
+        self.assertEqual(self._count(b" " * (2 * _COUNT_CHUNK) + b"\n" + long_line + b"\n"), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import unittest
 
-from ledgerflow.parsing import parse_bill_text, parse_receipt_text
+from ledgerflow.parsing import _first_date, parse_bill_text, parse_receipt_text
 
 
 class TestParsing(unittest.TestCase):
@@ -28,3 +28,13 @@ class TestParsing(unittest.TestCase):
         self.assertIsInstance(parsed.get("missingFields"), list)
         self.assertIn("needsReview", parsed)
         self.assertGreaterEqual(parsed.get("confidence", 0.0), 0.4)
+
+    def test_first_date_prefers_iso_then_dot_then_slash(self) -> None:
+        self.assertEqual(_first_date("paid 02/10/2026 ref 11.02.2026 on 2026-02-12"), "2026-02-12")
+        self.assertEqual(_first_date("paid 02/10/2026 ref 11.02.2026"), "2026-02-11")
+        self.assertEqual(_first_date("paid 02/10/2026"), "2026-02-10")
+        # An invalid first ISO date falls through to the other formats.
+        self.assertEqual(_first_date("2026-13-01 then 2026-02-03 or 02/10/2026"), "2026-02-10")
+        # ISO keeps priority even when it overlaps an earlier SLASH candidate.
+        self.assertEqual(_first_date("12/01/2026-05-06"), "2026-05-06")
+        self.assertIsNone(_first_date("no dates here"))
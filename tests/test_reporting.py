@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from ledgerflow.bootstrap import init_data_layout
+from ledgerflow.ids import new_id
+from ledgerflow.layout import layout_for
+from ledgerflow.reporting import _load_category_labels, monthly_report_data
+from ledgerflow.storage import append_jsonl, write_json
+
+
+def _tx(*, occurred_at: str, amount: str, merchant: str, source_type: str = "bank_csv", category_id: str = "groceries") -> dict:
+    return {
+        "txId": new_id("tx"),
+        "source": {"docId": new_id("doc"), "sourceType": source_type},
+        "occurredAt": occurred_at,
+        "amount": {"value": amount, "currency": "USD"},
+        "merchant": merchant,
+        "category": {"id": category_id, "confidence": 1.0},
+        "tags": [],
+        "links": {"receiptDocId": None, "billDocId": None},
+    }
+
+
+class TestReporting(unittest.TestCase):
+    def test_category_labels_follow_rewrites_and_are_copies(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            layout = layout_for(Path(td) / "data")
+            init_data_layout(layout, write_defaults=True)
+            write_json(layout.categories_path, {"categories": [{"id": "food", "label": "Food"}]})
+
+            labels = _load_category_labels(layout)
+            self.assertEqual(labels, {"food": "Food"})
+            labels["food"] = "mutated"
+            self.assertEqual(_load_category_labels(layout), {"food": "Food"})
+
+            write_json(layout.categories_path, {"categories": [{"id": "food", "label": "Groceries & Food"}]})
+            st = layout.categories_path.stat()
+            os.utime(layout.categories_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+            self.assertEqual(_load_category_labels(layout), {"food": "Groceries & Food"})
+
+    def test_monthly_summary_and_spikes(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            layout = layout_for(Path(td) / "data")
+            init_data_layout(layout, write_defaults=True)
+            for mo in ("2025-11", "2025-12", "2026-01"):
+                append_jsonl(layout.transactions_path, _tx(occurred_at=f"{mo}-05", amount="-40.00", merchant="Shop"))
+            append_jsonl(layout.transactions_path, _tx(occurred_at="2026-02-05", amount="-200.00", merchant="Shop"))
+            append_jsonl(layout.transactions_path, _tx(occurred_at="2026-02-06", amount="-5.50", merchant="Cafe", source_type="manual"))
+
+            data = monthly_report_data(layout, month="2026-02")
+            self.assertEqual(data["summary"], {"USD": {"spend": "205.50", "income": "0", "net": "-205.50"}})
+            self.assertEqual(
+                data["categorySpikes"],
+                [{"currency": "USD", "categoryId": "groceries", "current": "205.50", "avgPrev3": "40.00"}],
+            )
+            self.assertEqual(
+                data["sourceSummary"],
+                [
+                    {"sourceType": "bank_csv", "count": 1, "spend": "200.00", "income": "0"},
+                    {"sourceType": "manual", "count": 1, "spend": "5.50", "income": "0"},
+                ],
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
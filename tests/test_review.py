@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from ledgerflow.bootstrap import init_data_layout
+from ledgerflow.layout import layout_for
+from ledgerflow.review import _LOW_PARSE_REASONS, _float_or_zero, _low_conf_reason, _round2, review_queue
+from ledgerflow.storage import append_jsonl, write_json
+
+
+def _seed_parse(layout, doc_id: str, parsed: dict) -> Path:
+    path = layout.sources_dir / doc_id / "parse.json"
+    write_json(path, parsed)
+    return path
+
+
+class TestReviewQueue(unittest.TestCase):
+    def test_source_items_follow_parse_json_rewrites(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            layout = layout_for(Path(td) / "data")
+            init_data_layout(layout, write_defaults=True)
+            write_json(layout.sources_index_path, {"version": 1, "docs": [{"docId": "doc_1", "sourceType": "receipt"}]})
+            path = _seed_parse(layout, "doc_1", {"type": "receipt", "date": "2026-02-10", "confidence": 0.5, "merchant": "Cafe"})
+
+            q1 = review_queue(layout, date="2026-02-10")
+            self.assertEqual(q1["items"][0]["reasons"], ["low_parse_confidence:0.50", "missing_total"])
+            self.assertTrue(layout.review_cache_path.exists())
+            self.assertEqual(review_queue(layout, date="2026-02-10")["items"], q1["items"])
+
+            write_json(path, {"type": "receipt", "date": "2026-02-10", "confidence": 0.9, "merchant": "Cafe", "total": {"value": "1"}})
+            st = path.stat()
+            os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+            self.assertEqual(review_queue(layout, date="2026-02-10")["items"], [])
+
+            for junk in (b"not a cache", b"[\xff\xff\xff\x7f"):
+                layout.review_cache_path.write_bytes(junk)
+                self.assertEqual(review_queue(layout, date="2026-02-10")["counts"]["sourceParses"], 0)
+
+    def test_counts_cover_items_past_the_limit(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            layout = layout_for(Path(td) / "data")
+            init_data_layout(layout, write_defaults=True)
+            docs = []
+            for i in range(3):
+                docs.append({"docId": f"doc_{i}", "sourceType": "bill"})
+                _seed_parse(layout, f"doc_{i}", {"type": "bill", "confidence": 0.9, "vendor": "Power Co"})
+            write_json(layout.sources_index_path, {"version": 1, "docs": docs})
+
+            q = review_queue(layout, limit=2)
+            self.assertEqual([i["docId"] for i in q["items"]], ["doc_2", "doc_1"])
+            self.assertEqual(q["counts"], {"transactions": 0, "sourceParses": 3, "total": 3})
+
+    def test_date_keeps_only_that_days_live_txs(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            layout = layout_for(Path(td) / "data")
+            init_data_layout(layout, write_defaults=True)
+            append_jsonl(layout.transactions_path, {"txId": "tx_1", "occurredAt": "2026-02-10"})
+            append_jsonl(layout.transactions_path, {"txId": "tx_2", "occurredAt": "2026-02-11"})
+            append_jsonl(layout.transactions_path, {"txId": "tx_3", "postedAt": "2026-02-10"})
+            append_jsonl(layout.corrections_path, {"txId": "tx_3", "type": "tombstone"})
+
+            q = review_queue(layout, date="2026-02-10")
+            self.assertEqual([i["txId"] for i in q["items"]], ["tx_1"])
+            self.assertEqual(q["counts"]["transactions"], 1)
+
+    def test_confidence_formatting_matches_round_and_format(self) -> None:
+        for conf in [0.0, -0.0, 0.35, 0.257, 0.995, 1.0, 1.5, -0.2, float("nan"), _float_or_zero("0.42")]:
+            self.assertEqual(
+                _low_conf_reason(_LOW_PARSE_REASONS, "low_parse_confidence", conf),
+                f"low_parse_confidence:{conf:.2f}",
+            )
+        for x in [0.0, -0.0, 0.125, 0.35, 0.6000000000000001, -0.255, 1.0, 7.5, float("inf"), float("nan")]:
+            self.assertEqual(repr(_round2(x)), repr(round(x, 2)))
+        self.assertEqual(_float_or_zero(None), 0.0)
+        self.assertEqual(_float_or_zero("abc"), 0.0)
+        self.assertEqual(_float_or_zero(10**400), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,12 +1,13 @@
 from __future__ import annotations
 
+import os
 import tempfile
 import unittest
 from pathlib import Path
 
 from ledgerflow.layout import layout_for
-from ledgerflow.sources import register_file
-from ledgerflow.storage import read_json
+from ledgerflow.sources import index_docs, register_file
+from ledgerflow.storage import read_json, write_json
 
 
 class TestSources(unittest.TestCase):
@@ -23,3 +24,18 @@ class TestSources(unittest.TestCase):
             doc2 = register_file(layout.sources_dir, layout.sources_index_path, sample, copy_into_sources=False)
             self.assertEqual(doc1["docId"], doc2["docId"])
 
+    def test_index_docs_sees_same_size_replacement(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            index_path = Path(td) / "index.json"
+            write_json(index_path, {"version": 1, "docs": [{"docId": "doc_a"}]})
+            st = index_path.stat()
+            docs = index_docs(index_path)
+            self.assertEqual(docs, ({"docId": "doc_a"},))
+
+            # Same size and mtime, new inode: an atomic replace within the mtime granularity.
+            tmp = Path(td) / "index.json.tmp"
+            write_json(tmp, {"version": 1, "docs": [{"docId": "doc_b"}]})
+            os.utime(tmp, ns=(st.st_atime_ns, st.st_mtime_ns))
+            os.replace(tmp, index_path)
+            self.assertEqual(index_docs(index_path), ({"docId": "doc_b"},))
+            self.assertEqual(index_docs(Path(td) / "missing.json"), ())